@@ -0,0 +1,136 @@
+# assets.py
+import os
+import threading
+import time
+import pygame
+
+
+class AssetRegistry:
+    """Load, convert and scale every image once and hand out shared surfaces.
+
+    Surfaces returned by get() are shared between every sprite that uses them,
+    so callers must treat them as read-only (copy before drawing onto one).
+
+    preload_async() decodes the files on a background thread while something
+    else (the title screen) runs; converting and scaling need the display, so
+    they still happen on the main thread the first time an asset is used.
+    """
+
+    def __init__(self):
+        self.specs = {}
+        self.surfaces = {}
+        self.stats = {}
+        self.decoded = {}
+        self.loader = None
+
+    def register(self, name, path, size=None, alpha=True, required=False,
+                 fallback_size=(50, 50), fallback_color=(0, 255, 0)):
+        self.specs[name] = {
+            'path': path,
+            'size': size,
+            'alpha': alpha,
+            'required': required,
+            'fallback_size': fallback_size,
+            'fallback_color': fallback_color,
+        }
+
+    def decode(self, name):
+        """Read and decode one file; returns (image or None, error, ms)"""
+        start = time.perf_counter()
+        try:
+            image, error = pygame.image.load(self.specs[name]['path']), None
+        except (pygame.error, FileNotFoundError) as e:
+            image, error = None, e
+        return image, error, (time.perf_counter() - start) * 1000
+
+    def _decode_all(self, names):
+        for name in names:
+            self.decoded[name] = self.decode(name)
+
+    def preload_async(self):
+        """Start decoding every asset that is not loaded yet on a background thread"""
+        names = [name for name in self.specs
+                 if name not in self.surfaces and name not in self.decoded]
+        self.loader = threading.Thread(target=self._decode_all, args=(names,), daemon=True)
+        self.loader.start()
+
+    def wait(self):
+        """Block until the background decode has finished"""
+        if self.loader is not None:
+            self.loader.join()
+            self.loader = None
+
+    def load(self, name):
+        spec = self.specs[name]
+        if name not in self.decoded:
+            self.wait()
+        image, error, decode_ms = self.decoded.pop(name, None) or self.decode(name)
+        start = time.perf_counter()
+        try:
+            if error is not None:
+                raise error
+            decoded_bytes = image.get_width() * image.get_height() * image.get_bytesize()
+            # convert() needs a display mode; skip it when there is none yet
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha() if spec['alpha'] else image.convert()
+            if spec['size'] is not None:
+                image = pygame.transform.scale(image, spec['size'])
+            file_bytes = os.path.getsize(spec['path'])
+        except (pygame.error, FileNotFoundError):
+            if spec['required']:
+                raise
+            # Fallback to rectangle if image loading fails
+            print(f"Image {spec['path']} not found. Using default rectangle.")
+            image = pygame.Surface(spec['fallback_size'])
+            image.fill(spec['fallback_color'])
+            file_bytes = 0
+            decoded_bytes = 0
+
+        self.surfaces[name] = image
+        self.stats[name] = {
+            'path': spec['path'],
+            'file_bytes': file_bytes,
+            'decoded_bytes': decoded_bytes,
+            'resident_bytes': image.get_width() * image.get_height() * image.get_bytesize(),
+            'decode_ms': decode_ms,
+            'ms': decode_ms + (time.perf_counter() - start) * 1000,
+        }
+        return image
+
+    def preload(self):
+        """Load every registered asset that is not loaded yet"""
+        self.wait()
+        for name in self.specs:
+            if name not in self.surfaces:
+                self.load(name)
+
+    def get(self, name):
+        image = self.surfaces.get(name)
+        if image is None:
+            image = self.load(name)
+        return image
+
+    def report(self):
+        lines = []
+        for name, stat in self.stats.items():
+            lines.append(f"{name}: {stat['file_bytes']} bytes read, "
+                         f"{stat['decoded_bytes']} bytes decoded, "
+                         f"{stat['resident_bytes']} bytes resident, {stat['ms']:.1f} ms")
+        total_ms = sum(stat['ms'] for stat in self.stats.values())
+        total_bytes = sum(stat['decoded_bytes'] for stat in self.stats.values())
+        lines.append(f"total: {total_bytes} bytes decoded, {total_ms:.1f} ms")
+        return lines
+
+
+assets = AssetRegistry()
+
+# Player sprite sheets are sliced into frames, so they keep their original size
+assets.register('walk', "Walk.png", required=True)
+assets.register('idle', "Idle.png", required=True)
+assets.register('punch', "Attack.png", required=True)
+assets.register('fire', "fire.png", size=(20, 20), required=True)
+
+assets.register('drone.png', "assets/drone.png", size=(50, 50), fallback_size=(60, 60))
+assets.register('virussymbol.png', "assets/virussymbol.png", size=(50, 50), fallback_size=(60, 60))
+assets.register('server.png', "assets/server.png", size=(100, 20), fallback_size=(100, 20),
+                fallback_color=(255, 255, 255))
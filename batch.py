@@ -0,0 +1,219 @@
+# batch.py
+"""Run many seeded headless sessions across a process pool.
+
+Each worker keeps one game and plays the sessions it is handed with a bot
+policy. Results stream back as JSON lines (one per session, as they finish)
+and are merged into a summary at the end.
+
+    python batch.py --runs 200 --policy hunter --ticks 20000 --out runs.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+# Must be set before pygame initializes its display, in every worker. SDL
+# would otherwise swallow the SIGTERM the pool uses to stop its workers.
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+
+import numpy as np
+
+from env import (ACTION_FIRE, ACTION_JUMP, ACTION_LEFT, ACTION_RIGHT, NUM_ACTIONS,
+                 GoneRogueEnv)
+from pool import pool_stats
+
+
+# Policies map an observation (and the session's random.Random) to an action
+def idle_policy(obs, rng):
+    return 0
+
+
+def random_policy(obs, rng):
+    return rng.randrange(NUM_ACTIONS)
+
+
+def hopper_policy(obs, rng):
+    """Keep jumping and steer towards the nearest platform"""
+    action = ACTION_JUMP
+    present, dx = GoneRogueEnv.platform_block(obs)[0, :2]
+    if present:
+        if dx < -0.02:
+            action |= ACTION_LEFT
+        elif dx > 0.02:
+            action |= ACTION_RIGHT
+    return action
+
+
+def hunter_policy(obs, rng):
+    """Hop between platforms and now and then shoot the nearest enemy"""
+    action = hopper_policy(obs, rng)
+    if obs[4] and GoneRogueEnv.enemy_block(obs)[0, 0] and rng.random() < 0.1:
+        action |= ACTION_FIRE
+    return action
+
+
+POLICIES = {
+    'idle': idle_policy,
+    'random': random_policy,
+    'hopper': hopper_policy,
+    'hunter': hunter_policy,
+}
+
+# Per-worker state, set up once by init_worker
+worker_env = None
+worker_config = None
+
+
+def init_worker(config):
+    global worker_env, worker_config
+    worker_config = config
+    worker_env = GoneRogueEnv(enemy_spawn_delay=config['enemy_spawn_delay'],
+                              platform_spawn_delay=config['platform_spawn_delay'],
+                              unlock_times=config['unlock_times'],
+                              max_ticks=config['ticks'])
+
+
+def play(seed):
+    """Play one session in this worker and return its result record"""
+    env = worker_env
+    policy = POLICIES[worker_config['policy']]
+    rng = random.Random(seed)
+    game = env.game
+
+    obs = env.reset(seed)
+    game.enemy_grid.pair_tests = 0
+    pools_before = pool_stats()
+    start = time.perf_counter()
+    done = False
+    while not done:
+        obs, _, done, info = env.step(policy(obs, rng), obs)
+    elapsed = time.perf_counter() - start
+
+    pools = {name: {key: stats[key] - pools_before[name][key] for key in ('hits', 'misses')}
+             for name, stats in pool_stats().items()}
+    return {
+        'seed': seed,
+        'policy': worker_config['policy'],
+        'score': info['score'],
+        'ticks': info['ticks'],
+        'game_over': info['game_over'],
+        'abilities': list(env.picked),
+        'seconds': elapsed,
+        'ticks_per_second': info['ticks'] / elapsed if elapsed else 0.0,
+        'pair_tests': game.enemy_grid.pair_tests,
+        'pools': pools,
+        'worker': os.getpid(),
+    }
+
+
+def summarize(results, wall_seconds):
+    """Merge per-run records into one summary dict"""
+    if not results:
+        return {
+            'runs': 0, 'workers': 0, 'game_over_rate': 0.0,
+            'score_mean': 0.0, 'score_p50': 0.0, 'score_p95': 0.0, 'score_max': 0,
+            'ticks_mean': 0.0, 'ticks_p50': 0.0, 'total_ticks': 0,
+            'wall_seconds': wall_seconds, 'ticks_per_second': 0.0, 'ability_picks': {},
+        }
+    scores = np.array([result['score'] for result in results])
+    ticks = np.array([result['ticks'] for result in results])
+    picks = {}
+    for result in results:
+        for name in result['abilities']:
+            picks[name] = picks.get(name, 0) + 1
+    total_ticks = int(ticks.sum())
+    return {
+        'runs': len(results),
+        'workers': len({result['worker'] for result in results}),
+        'game_over_rate': sum(result['game_over'] for result in results) / len(results),
+        'score_mean': float(scores.mean()),
+        'score_p50': float(np.percentile(scores, 50)),
+        'score_p95': float(np.percentile(scores, 95)),
+        'score_max': int(scores.max()),
+        'ticks_mean': float(ticks.mean()),
+        'ticks_p50': float(np.percentile(ticks, 50)),
+        'total_ticks': total_ticks,
+        'wall_seconds': wall_seconds,
+        'ticks_per_second': total_ticks / wall_seconds if wall_seconds else 0.0,
+        'ability_picks': dict(sorted(picks.items(), key=lambda item: -item[1])),
+    }
+
+
+def run_batch(runs, seed=None, policy='hunter', ticks=20000, workers=None, out=None,
+              enemy_spawn_delay=None, platform_spawn_delay=None, unlock_times=None):
+    """Shard runs seeded sessions across workers; returns (results, summary).
+
+    Each result is written to out (a file object) as a JSON line the moment
+    its worker finishes it.
+    """
+    seeds = random.Random(seed)
+    session_seeds = [seeds.getrandbits(32) for _ in range(runs)]
+    config = {
+        'policy': policy,
+        'ticks': ticks,
+        'enemy_spawn_delay': enemy_spawn_delay,
+        'platform_spawn_delay': platform_spawn_delay,
+        'unlock_times': unlock_times,
+    }
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, init_worker, (config,)) as pool:
+        for result in pool.imap_unordered(play, session_seeds):
+            results.append(result)
+            if out is not None:
+                out.write(json.dumps(result) + '\n')
+                out.flush()
+    wall = time.perf_counter() - start
+    return results, summarize(results, wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded Gone Rogue sessions in parallel")
+    parser.add_argument('--runs', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed for the per-run seeds")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='hunter')
+    parser.add_argument('--ticks', type=int, default=20000,
+                        help="tick limit per session")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument('--out', metavar='PATH', default=None,
+                        help="write per-run JSON lines here instead of stdout")
+    parser.add_argument('--summary', metavar='PATH', default=None,
+                        help="also write the merged summary as JSON")
+    parser.add_argument('--enemy-spawn-delay', type=int, default=None)
+    parser.add_argument('--platform-spawn-delay', type=int, default=None)
+    parser.add_argument('--unlock-times', type=int, nargs='+', default=None,
+                        help="sim milliseconds at which abilities unlock")
+    args = parser.parse_args()
+
+    out = open(args.out, 'w') if args.out else sys.stdout
+    try:
+        _, summary = run_batch(args.runs, args.seed, args.policy, args.ticks, args.workers, out,
+                               args.enemy_spawn_delay, args.platform_spawn_delay,
+                               args.unlock_times)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2)
+    print(f"{summary['runs']} runs on {summary['workers']} workers in "
+          f"{summary['wall_seconds']:.1f} s ({summary['ticks_per_second']:.0f} ticks/s); "
+          f"score mean {summary['score_mean']:.0f}, p50 {summary['score_p50']:.0f}, "
+          f"p95 {summary['score_p95']:.0f}; survival p50 {summary['ticks_p50']:.0f} ticks; "
+          f"game over in {summary['game_over_rate']:.0%}", file=sys.stderr)
+    if summary['ability_picks']:
+        picks = ", ".join(f"{name} {count}" for name, count in summary['ability_picks'].items())
+        print(f"abilities picked: {picks}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# benchmark.py
+"""Micro-benchmarks for the game's hot paths.
+
+Run one with `python benchmark.py <name>`; `python benchmark.py --help` lists them.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+
+def timed(fn, repeat):
+    """Call fn repeat times and return the mean cost in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_leaderboard(args):
+    from leaderboard import LeaderboardStore
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LeaderboardStore(os.path.join(tmp, 'highscores.json'))
+        store.scores.update((f"hacker{i}", rng.randint(0, 100000)) for i in range(args.entries))
+        store.ranking = sorted((-score, name) for name, score in store.scores.items())
+        names = list(store.scores)
+
+        def sort_top():
+            sorted(store.scores.items(), key=lambda x: x[1], reverse=True)[:3]
+
+        def linear_rank():
+            name = rng.choice(names)
+            score = store.scores[name]
+            sum(1 for other in store.scores.values() if other > score)
+
+        def submit():
+            store.submit(rng.choice(names), rng.randint(0, 200000))
+
+        print(f"leaderboard with {args.entries} entries")
+        print(f"  full sort top-3 : {timed(sort_top, 20):10.1f} us")
+        print(f"  indexed top-3   : {timed(lambda: store.top(3), 10000):10.1f} us")
+        print(f"  linear rank     : {timed(linear_rank, 20):10.1f} us")
+        print(f"  indexed rank    : {timed(lambda: store.rank(rng.choice(names)), 10000):10.1f} us")
+        print(f"  submit          : {timed(submit, 1000):10.1f} us")
+        store.close()
+
+
+def bench_collisions(args):
+    import pygame
+    from spatial import SpatialHash
+
+    rng = random.Random(args.seed)
+    width, height = 800, 600
+
+    def make_group(count, size):
+        group = pygame.sprite.Group()
+        for _ in range(count):
+            sprite = pygame.sprite.Sprite()
+            sprite.rect = pygame.Rect(rng.randint(0, width), rng.randint(0, height), size, size)
+            group.add(sprite)
+        return group
+
+    print(f"{'enemies':>8} {'fireballs':>9} {'linear pairs':>13} {'linear ms':>10} "
+          f"{'grid pairs':>11} {'grid ms':>8}")
+    for count in args.counts:
+        enemies = make_group(count, 50)
+        fireballs = make_group(count, 20)
+
+        def linear():
+            for fireball in fireballs:
+                pygame.sprite.spritecollide(fireball, enemies, False)
+
+        grid = SpatialHash(args.cell_size)
+
+        def broadphase():
+            grid.build(enemies)
+            for fireball in fireballs:
+                grid.collide(fireball)
+
+        repeat = max(1, 2000 // count)
+        linear_ms = timed(linear, repeat) / 1000
+        grid.pair_tests = 0
+        grid_ms = timed(broadphase, repeat) / 1000
+        print(f"{count:>8} {count:>9} {count * count:>13} {linear_ms:>10.2f} "
+              f"{grid.pair_tests // repeat:>11} {grid_ms:>8.2f}")
+
+
+def bench_particles(args):
+    import pygame
+    from particles import ParticleSystem
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    print(f"{'live':>8} {'update ms':>10} {'draw ms':>8}")
+    for count in args.counts:
+        particles = ParticleSystem(seed=args.seed)
+        # Lifetimes are 5-10 ticks, so topping up count/7 per tick holds about count live
+        per_tick = max(1, count // 7)
+        for _ in range(20):
+            particles.emit(400, 300, per_tick)
+            particles.update()
+        particles.draw(screen)
+
+        update_ms = draw_ms = 0
+        live = 0
+        frames = 100
+        for _ in range(frames):
+            particles.emit(400, 300, per_tick)
+            start = time.perf_counter()
+            particles.update()
+            middle = time.perf_counter()
+            particles.draw(screen)
+            update_ms += middle - start
+            draw_ms += time.perf_counter() - middle
+            live += len(particles)
+        print(f"{live // frames:>8} {update_ms / frames * 1000:>10.2f} "
+              f"{draw_ms / frames * 1000:>8.2f}")
+    pygame.quit()
+
+
+def bench_render(args):
+    import pygame
+    from render import RenderQueue
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    screen = pygame.display.set_mode((800, 600))
+    rng = random.Random(args.seed)
+
+    # A handful of shared images across a few layers, like the game's sprites
+    images = []
+    for size in (20, 50, 100):
+        for shade in (80, 160, 240):
+            image = pygame.Surface((size, size if size != 100 else 20), pygame.SRCALPHA)
+            image.fill((0, shade, 0, 200))
+            images.append(image.convert_alpha())
+
+    print(f"{'sprites':>8} {'blit loop ms':>13} {'Group.draw ms':>14} {'queue ms':>9} "
+          f"{'sorted queue ms':>16}")
+    for count in args.counts:
+        group = pygame.sprite.Group()
+        for _ in range(count):
+            sprite = pygame.sprite.Sprite()
+            sprite.image = rng.choice(images)
+            sprite.rect = sprite.image.get_rect(topleft=(rng.randint(0, 780), rng.randint(0, 580)))
+            sprite._layer = rng.randint(0, 4)
+            group.add(sprite)
+        queue = RenderQueue()
+        sorted_queue = RenderQueue(sort_by_image=True)
+
+        def blit_loop():
+            for sprite in group:
+                screen.blit(sprite.image, sprite.rect)
+
+        def queued(queue):
+            queue.add_sprites(group)
+            queue.flush(screen)
+
+        repeat = max(3, 20000 // count)
+        print(f"{count:>8} {timed(blit_loop, repeat) / 1000:>13.2f} "
+              f"{timed(lambda: group.draw(screen), repeat) / 1000:>14.2f} "
+              f"{timed(lambda: queued(queue), repeat) / 1000:>9.2f} "
+              f"{timed(lambda: queued(sorted_queue), repeat) / 1000:>16.2f}")
+    pygame.quit()
+
+
+def bench_movers(args):
+    import pygame
+    from entities import KIND_ENEMY, EntityStore, StoredSprite
+
+    rng = random.Random(args.seed)
+    width, height = 800, 600
+
+    class RectMover(pygame.sprite.Sprite):
+        def update(self):
+            self.rect.x += self.vel_x
+            self.rect.y += self.vel_y
+
+    print(f"{'movers':>8} {'Group.update ms':>16} {'store step ms':>14} {'store cull ms':>14}")
+    for count in args.counts:
+        group = pygame.sprite.Group()
+        store = EntityStore()
+        for _ in range(count):
+            rect = pygame.Rect(rng.randint(0, width), rng.randint(0, height), 50, 50)
+            vel = (rng.uniform(-3, 3), rng.uniform(-3, 3))
+            mover = RectMover()
+            mover.rect = rect.copy()
+            mover.vel_x, mover.vel_y = vel
+            group.add(mover)
+            stored = StoredSprite()
+            stored.rect = rect.copy()
+            store.add(stored, vel, KIND_ENEMY)
+
+        repeat = max(3, 100000 // count)
+        update_ms = timed(group.update, repeat) / 1000
+        step_ms = timed(store.step, repeat) / 1000
+        # Huge bounds: measures the mask cost without emptying the store
+        cull_ms = timed(lambda: store.cull(10 ** 9, 10 ** 9), repeat) / 1000
+        print(f"{count:>8} {update_ms:>16.2f} {step_ms:>14.2f} {cull_ms:>14.2f}")
+
+
+def bench_pixels(args):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from inputs import InputFrame
+    from main import Game
+    from pixels import PixelObserver
+
+    # A real frame from a seeded run, rain and sprites included
+    game = Game(headless=True)
+    game.init_game(player_name='benchmark', seed=args.seed)
+    idle = InputFrame()
+    for _ in range(300):
+        game.step(idle)
+    game.draw()
+    draw_ms = timed(game.draw, 100) / 1000
+
+    print(f"full frame draw: {draw_ms:.2f} ms")
+    print(f"{'size':>9} {'gray ms':>8} {'palette ms':>11}")
+    for size in ((160, 120), (84, 84), (64, 48), (32, 24)):
+        costs = []
+        for mode in ('gray', 'palette'):
+            observer = PixelObserver((game.WIDTH, game.HEIGHT), size, mode)
+            for _ in range(200):
+                observer.observe(game.screen)
+            costs.append(observer.mean_ms())
+        print(f"{size[0]:>4}x{size[1]:<4} {costs[0]:>8.2f} {costs[1]:>11.2f}")
+
+
+def bench_snapshot(args):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from enemy import enemy_pool
+    from entities import KIND_ENEMY, KIND_PLATFORM
+    from inputs import InputFrame
+    from main import Game
+    from platforms import platform_pool
+    from player import fireball_pool
+
+    game = Game(headless=True)
+    idle = InputFrame()
+    print(f"{'entities':>8} {'bytes':>8} {'snapshot us':>12} {'restore us':>11} {'matches':>8}")
+    for count in args.counts:
+        game.init_game(player_name='benchmark', seed=args.seed)
+        for _ in range(60):
+            game.step(idle)
+        # Top up to count sprites: mostly enemies and platforms, a few fireballs
+        rng = game.rng
+        for i in range(count):
+            if i % 10 == 9:
+                fireball = fireball_pool.acquire(game.player.rect.center,
+                                                 (rng.randint(0, 800), rng.randint(0, 600)),
+                                                 game.fireball_sprites)
+                game.fireballs.add(fireball)
+                game.all_sprites.add(fireball)
+            elif i % 2:
+                enemy = enemy_pool.acquire(game.WIDTH, game.HEIGHT, rng)
+                game.all_sprites.add(enemy)
+                game.enemies.add(enemy)
+                game.movers.add(enemy, (enemy.vel_x, enemy.vel_y), KIND_ENEMY)
+            else:
+                platform = platform_pool.acquire(game.WIDTH, rng)
+                game.all_sprites.add(platform)
+                game.platforms.add(platform)
+                game.movers.add(platform, (platform.speed, 0), KIND_PLATFORM)
+        game.player.teleport_effects.emit(400, 300, 64)
+
+        digest = game.state_digest()
+        data = game.snapshot()
+        repeat = max(10, 20000 // count)
+        snapshot_us = timed(game.snapshot, repeat)
+        restore_us = timed(lambda: game.restore(data), repeat)
+        print(f"{count:>8} {len(data):>8} {snapshot_us:>12.1f} {restore_us:>11.1f} "
+              f"{str(game.state_digest() == digest):>8}")
+
+
+BENCHMARKS = {
+    'collisions': bench_collisions,
+    'leaderboard': bench_leaderboard,
+    'movers': bench_movers,
+    'particles': bench_particles,
+    'pixels': bench_pixels,
+    'render': bench_render,
+    'snapshot': bench_snapshot,
+}
+
+# Entity counts swept when --counts is not given
+DEFAULT_COUNTS = [100, 1000, 5000]
+BENCHMARK_COUNTS = {
+    'render': [100, 1000, 10000],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gone Rogue micro-benchmarks")
+    parser.add_argument('name', choices=sorted(BENCHMARKS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--entries', type=int, default=100000,
+                        help="leaderboard size")
+    parser.add_argument('--counts', type=int, nargs='+', default=None,
+                        help="entity counts to sweep (default 100 1000 5000; "
+                             "100 1000 10000 for render)")
+    parser.add_argument('--cell-size', type=int, default=64,
+                        help="spatial hash cell size in pixels")
+    args = parser.parse_args()
+    if args.counts is None:
+        args.counts = BENCHMARK_COUNTS.get(args.name, DEFAULT_COUNTS)
+    BENCHMARKS[args.name](args)
+
+
+if __name__ == "__main__":
+    main()
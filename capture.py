@@ -0,0 +1,187 @@
+# capture.py
+import multiprocessing
+import os
+import queue
+import shutil
+import subprocess
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.mov', '.webm', '.avi')
+
+
+def pixel_format_of(surface):
+    """ffmpeg name for the byte order of a 32-bit surface's pixels"""
+    if surface.get_bytesize() != 4:
+        raise ValueError("frame capture needs a 32-bit display surface")
+    rmask, gmask, bmask, _ = surface.get_masks()
+    if (rmask, gmask, bmask) == (0xff0000, 0xff00, 0xff):
+        return 'bgr0'
+    if (rmask, gmask, bmask) == (0xff, 0xff00, 0xff0000):
+        return 'rgb0'
+    raise ValueError(f"unsupported pixel masks {surface.get_masks()}")
+
+
+def encode_frames(shm_name, shape, pixel_format, path, fps, filled, done):
+    """Encoder process: turn ring slots named on filled into video or PNGs.
+
+    Every slot is handed back on done once written. The last message is
+    ('closed', frames written, error message or None).
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray(shape, dtype=np.uint32, buffer=shm.buf)
+    _, height, width = shape
+    encoder = None
+    if path.lower().endswith(VIDEO_EXTENSIONS):
+        encoder = subprocess.Popen(
+            ['ffmpeg', '-loglevel', 'error', '-y',
+             '-f', 'rawvideo', '-pix_fmt', pixel_format,
+             '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+             '-c:v', 'libx264', '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE)
+    else:
+        os.makedirs(path, exist_ok=True)
+
+    frame = None
+    written = 0
+    error = None
+    while True:
+        index = filled.get()
+        if index is None:
+            break
+        if error is None:
+            try:
+                frame = ring[index]
+                if encoder is not None:
+                    encoder.stdin.write(frame.data)
+                else:
+                    channels = frame.view(np.uint8).reshape(height, width, 4)
+                    # The fourth byte is padding, not alpha; keep the colour bytes
+                    rgb = channels[..., 2::-1] if pixel_format == 'bgr0' else channels[..., :3]
+                    image = pygame.image.frombuffer(np.ascontiguousarray(rgb), (width, height),
+                                                    'RGB')
+                    pygame.image.save(image, os.path.join(path, f"frame_{written:06d}.png"))
+                written += 1
+            except (OSError, pygame.error) as e:
+                # Keep handing slots back so the game never waits on us
+                error = str(e)
+        done.put(index)
+
+    if encoder is not None:
+        encoder.stdin.close()
+        encoder.wait()
+    del ring, frame
+    shm.close()
+    done.put(('closed', written, error))
+
+
+class FrameCapture:
+    """Records presented frames without stalling the game loop.
+
+    grab() reads the screen through a surfarray view of its pixel buffer and
+    copies it straight into a free slot of a preallocated ring in shared
+    memory; nothing is allocated or converted on the main thread. A separate
+    process encodes filled slots (PNG encoding would otherwise hold the GIL
+    the game needs): raw frames are piped to ffmpeg when path has a video
+    extension, otherwise written as a numbered PNG sequence in the directory
+    path. When every slot is still waiting to be encoded, the frame is
+    dropped and counted instead of waiting.
+    """
+
+    def __init__(self, path, size, fps=60, slots=16):
+        self.path = path
+        self.width, self.height = size
+        self.fps = fps
+        self.shape = (slots, self.height, self.width)
+        self.free = list(range(slots))
+
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.error = None
+        self.shm = None
+        self.ring = None
+        self.encoder = None
+
+    def start(self, surface):
+        """Set up the ring and the encoder process for frames like surface's"""
+        pixel_format = pixel_format_of(surface)
+        if self.path.lower().endswith(VIDEO_EXTENSIONS) and shutil.which('ffmpeg') is None:
+            raise FileNotFoundError("ffmpeg is needed to record video; "
+                                    "give a directory to save PNG frames instead")
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.shape)) * 4)
+        self.ring = np.ndarray(self.shape, dtype=np.uint32, buffer=self.shm.buf)
+
+        # spawn, not fork: the game process has SDL and writer threads running
+        context = multiprocessing.get_context('spawn')
+        self.filled = context.Queue()
+        self.done = context.Queue()
+        self.encoder = context.Process(
+            target=encode_frames,
+            args=(self.shm.name, self.shape, pixel_format, self.path, self.fps,
+                  self.filled, self.done),
+            daemon=True)
+        self.encoder.start()
+
+    def reclaim(self):
+        """Take back slots the encoder has finished with"""
+        while True:
+            try:
+                message = self.done.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(message, tuple):
+                _, self.written, self.error = message
+                return
+            self.free.append(message)
+
+    def grab(self, surface):
+        """Queue the current contents of surface; never blocks"""
+        if self.encoder is None:
+            self.start(surface)
+        if not self.free:
+            self.reclaim()
+            if not self.free:
+                self.dropped += 1
+                return False
+        index = self.free.pop()
+        # pixels2d is a view of the surface buffer, indexed [x, y]; its
+        # transpose has the buffer's row-major layout, so this is one memcpy
+        view = pygame.surfarray.pixels2d(surface)
+        np.copyto(self.ring[index], view.T)
+        del view  # Unlocks the surface
+        self.captured += 1
+        self.filled.put(index)
+        return True
+
+    def close(self):
+        """Wait for the queued frames to be written and stop the encoder"""
+        if self.encoder is None:
+            return
+        self.filled.put(None)
+        while True:
+            try:
+                message = self.done.get(timeout=0.5)
+            except queue.Empty:
+                if self.encoder.is_alive():
+                    continue
+                self.error = f"encoder exited with code {self.encoder.exitcode}"
+                break
+            if isinstance(message, tuple):
+                _, self.written, self.error = message
+                break
+            self.free.append(message)
+        self.encoder.join()
+        self.encoder = None
+        self.ring = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def report(self):
+        line = (f"{self.captured} frames captured, {self.written} written, "
+                f"{self.dropped} dropped to {self.path}")
+        if self.error is not None:
+            line += f" (writing failed: {self.error})"
+        return line
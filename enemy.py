@@ -2,26 +2,30 @@ import pygame
 import random
 import os
 
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, screen_width, screen_height):
+from assets import assets
+from entities import StoredSprite
+from pool import SpritePool
+from render import LAYER_ENEMIES
+
+class Enemy(StoredSprite):
+    _layer = LAYER_ENEMIES
+
+    # List of possible enemy image filenames
+    enemy_images = [
+        'drone.png',
+        'virussymbol.png',
+    ]
+
+    def __init__(self, screen_width, screen_height, rng=random):
         super().__init__()
-        # List of possible enemy image filenames
-        self.enemy_images = [
-            'drone.png',
-            'virussymbol.png',
-        ]
-        
-        try:
-            # Randomly choose one of the enemy images
-            chosen_image = random.choice(self.enemy_images)
-            self.image = pygame.image.load("assets/" + str(chosen_image)).convert_alpha()
-            # Scale the image to desired size
-            self.image = pygame.transform.scale(self.image, (50, 50))  # Adjust size as needed
-        except pygame.error:
-            # Fallback to rectangle if image loading fails
-            print(f"Enemy image not found. Using default rectangle.")
-            self.image = pygame.Surface((60, 60))
-            self.image.fill((0, 255, 0))
+        self.reset(screen_width, screen_height, rng)
+
+    def reset(self, screen_width, screen_height, rng=random):
+        """Set up a new or recycled enemy; rng is the game's random source"""
+        self.rng = rng
+        # Randomly choose one of the enemy images (loaded once and shared)
+        chosen_image = self.rng.choice(self.enemy_images)
+        self.image = assets.get(chosen_image)
             
         self.rect = self.image.get_rect()
         
@@ -34,20 +38,20 @@ class Enemy(pygame.sprite.Sprite):
 
     def spawn_position(self, screen_width, screen_height):
         # Choose a random side (0: top, 1: right, 2: bottom, 3: left)
-        side = random.randint(0, 3)
+        side = self.rng.randint(0, 3)
         
         if side == 0:  # Top
-            self.rect.x = random.randint(0, screen_width - self.rect.width)
+            self.rect.x = self.rng.randint(0, screen_width - self.rect.width)
             self.rect.y = -self.rect.height
         elif side == 1:  # Right
             self.rect.x = screen_width
-            self.rect.y = random.randint(0, screen_height - self.rect.height)
+            self.rect.y = self.rng.randint(0, screen_height - self.rect.height)
         elif side == 2:  # Bottom
-            self.rect.x = random.randint(0, screen_width - self.rect.width)
+            self.rect.x = self.rng.randint(0, screen_width - self.rect.width)
             self.rect.y = screen_height
         else:  # Left
             self.rect.x = -self.rect.width
-            self.rect.y = random.randint(0, screen_height - self.rect.height)
+            self.rect.y = self.rng.randint(0, screen_height - self.rect.height)
 
     def calculate_velocity(self, screen_width, screen_height):
         # Calculate direction towards center of screen
@@ -65,7 +69,5 @@ class Enemy(pygame.sprite.Sprite):
         
         return dx, dy
 
-    def update(self):
-        # Move enemy
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
\ No newline at end of file
+
+enemy_pool = SpritePool(Enemy)
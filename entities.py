@@ -0,0 +1,121 @@
+# entities.py
+import numpy as np
+
+from pool import PooledSprite
+
+# Type ids stored alongside each mover
+KIND_PLATFORM = 0
+KIND_ENEMY = 1
+
+
+class EntityStore:
+    """Structure-of-arrays storage for sprites that move in straight lines.
+
+    Positions, velocities, sizes and type ids live in NumPy arrays, so one
+    vectorized step moves every mover and one bounds mask finds the ones that
+    left the screen. Positions are floats: fractional velocities accumulate
+    instead of being truncated by Rect, and rects are written back (floored)
+    after each step for collisions and drawing. The store keeps the rect a
+    sprite had when added, so don't replace sprite.rect while it is stored.
+    """
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.size = np.zeros((capacity, 2))
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.sprites = []
+        self.rects = []  # Each sprite's rect, kept in slot order for the sync
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, needed):
+        capacity = max(needed, len(self.kind) * 2)
+        for name in ('pos', 'vel', 'size', 'kind'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, sprite, velocity, kind):
+        """Start moving sprite from its current rect at velocity (px per tick)"""
+        index = self.count
+        if index == len(self.kind):
+            self.grow(index + 1)
+        rect = sprite.rect
+        self.pos[index] = rect.topleft
+        self.vel[index] = velocity
+        self.size[index] = rect.size
+        self.kind[index] = kind
+        self.sprites.append(sprite)
+        self.rects.append(rect)
+        sprite.store = self
+        sprite.slot = index
+        self.count = index + 1
+
+    def remove(self, sprite):
+        """Drop one sprite, moving the last mover into its slot"""
+        index = sprite.slot
+        last = self.count - 1
+        if index != last:
+            moved = self.sprites[last]
+            for array in (self.pos, self.vel, self.size, self.kind):
+                array[index] = array[last]
+            self.sprites[index] = moved
+            self.rects[index] = self.rects[last]
+            moved.slot = index
+        self.sprites.pop()
+        self.rects.pop()
+        self.count = last
+        sprite.store = None
+        sprite.slot = -1
+
+    def clear(self):
+        """Forget every mover without killing it"""
+        for sprite in self.sprites:
+            sprite.store = None
+            sprite.slot = -1
+        self.sprites = []
+        self.rects = []
+        self.count = 0
+
+    def step(self):
+        """Move every mover one tick and sync their rects"""
+        n = self.count
+        if not n:
+            return
+        pos = self.pos[:n]
+        pos += self.vel[:n]
+        topleft = np.floor(pos).astype(np.int64)
+        for rect, x, y in zip(self.rects, topleft[:, 0].tolist(), topleft[:, 1].tolist()):
+            rect.x = x
+            rect.y = y
+
+    def cull(self, width, height):
+        """Kill every mover entirely outside (0, 0, width, height); returns how many"""
+        n = self.count
+        if not n:
+            return 0
+        pos = self.pos[:n]
+        far = pos + self.size[:n]
+        outside = ((far[:, 0] < 0) | (pos[:, 0] > width) |
+                   (far[:, 1] < 0) | (pos[:, 1] > height))
+        dead = np.flatnonzero(outside).tolist()
+        # Highest slot first, so every swap-remove pulls in a survivor
+        sprites = self.sprites
+        for index in reversed(dead):
+            sprites[index].kill()
+        return len(dead)
+
+
+class StoredSprite(PooledSprite):
+    """Pooled sprite that is moved by the EntityStore it was added to"""
+    store = None
+    slot = -1
+
+    def kill(self):
+        if self.store is not None:
+            self.store.remove(self)
+        super().kill()
@@ -0,0 +1,314 @@
+# env.py
+"""Reset/step environment around the headless game, for bots and balance sweeps.
+
+    env = GoneRogueEnv(seed=1, enemy_spawn_delay=90)
+    obs = env.reset()
+    obs, reward, done, info = env.step(ACTION_RIGHT | ACTION_JUMP)
+
+VectorEnv steps N independent games per call and returns their observations,
+rewards and done flags as stacked NumPy arrays.
+
+With pixel_size, observations are instead stacks of small grayscale or
+palette-index frames pooled from the drawn screen (see pixels.py).
+
+    python env.py --envs 16 --ticks 20000
+    python env.py --envs 4 --ticks 2000 --pixels 84 84 --frame-stack 4
+"""
+import argparse
+import os
+import random
+import time
+
+# Must be set before pygame initializes its display
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import numpy as np
+import pygame
+
+from entities import KIND_ENEMY, KIND_PLATFORM
+from headless import auto_pick
+from inputs import InputFrame
+from main import Game
+from pixels import PixelObserver
+
+# Actions are a bitmask of these
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_JUMP = 4
+ACTION_FIRE = 8  # Aims at the nearest enemy; needs the fireball ability
+NUM_ACTIONS = 16
+
+# Observation layout: player state, then the nearest enemies and platforms.
+# Each entity slot is (present, dx, dy, a, b) relative to the player's centre:
+# enemies carry their velocity, platforms their width and speed.
+PLAYER_FEATURES = 5
+ENTITY_FEATURES = 5
+NEAREST_ENEMIES = 4
+NEAREST_PLATFORMS = 4
+OBS_SIZE = PLAYER_FEATURES + (NEAREST_ENEMIES + NEAREST_PLATFORMS) * ENTITY_FEATURES
+
+
+class GoneRogueEnv:
+    """One headless game behind a reset/step interface.
+
+    The reward for a step is the change in score (one point per tick
+    survived, ten per enemy shot) minus death_penalty on the step the game
+    ends. Spawn delays and unlock times override the game's defaults.
+
+    Observations are the compact float32 vector described above, or, with
+    pixel_size=(width, height), the last frame_stack frames drawn after each
+    step, pooled to that size in pixel_mode ('gray' or 'palette').
+    """
+
+    def __init__(self, seed=None, enemy_spawn_delay=None, platform_spawn_delay=None,
+                 unlock_times=None, max_ticks=None, death_penalty=0.0, game=None,
+                 pixel_size=None, pixel_mode='gray', frame_stack=4):
+        self.game = game if game is not None else Game(headless=True)
+        if enemy_spawn_delay is not None:
+            self.game.enemy_spawn_delay = enemy_spawn_delay
+        if platform_spawn_delay is not None:
+            self.game.platform_spawn_delay = platform_spawn_delay
+        if unlock_times is not None:
+            self.game.ability_system.unlock_times = list(unlock_times)
+        self.max_ticks = max_ticks
+        self.death_penalty = death_penalty
+        self.pixels = None
+        if pixel_size is not None:
+            self.pixels = PixelObserver((self.game.WIDTH, self.game.HEIGHT), pixel_size,
+                                        pixel_mode, frame_stack)
+
+        # Episode seeds come from here, so a seeded env replays the same episodes
+        self.seeds = random.Random(seed)
+        self.ticks = 0
+        self.picked = []  # Ability names unlocked this episode, in order
+
+        # Frames without a click never change, so build them once
+        self.frames = [self.make_frame(action) for action in range(NUM_ACTIONS)]
+
+    @staticmethod
+    def make_frame(action, target=(0, 0)):
+        keys = []
+        if action & ACTION_LEFT:
+            keys.append(pygame.K_LEFT)
+        if action & ACTION_RIGHT:
+            keys.append(pygame.K_RIGHT)
+        if action & ACTION_JUMP:
+            keys.append(pygame.K_SPACE)
+        return InputFrame.make(keys, target, clicks=1 if action & ACTION_FIRE else 0)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = self.seeds.getrandbits(32)
+        self.game.init_game(player_name='env', seed=seed)
+        self.ticks = 0
+        self.picked = []
+        if self.pixels is not None:
+            self.pixels.reset()
+        return self.observation()
+
+    @property
+    def observation_shape(self):
+        return self.pixels.shape if self.pixels is not None else (OBS_SIZE,)
+
+    @property
+    def observation_dtype(self):
+        return np.uint8 if self.pixels is not None else np.float32
+
+    def nearest_enemy(self):
+        """Centre of the enemy closest to the player, or a point to its right"""
+        player = self.game.player.rect
+        store = self.game.movers
+        n = len(store)
+        enemies = np.flatnonzero(store.kind[:n] == KIND_ENEMY)
+        if not len(enemies):
+            return player.centerx + 100, player.centery
+        centre = store.pos[enemies] + store.size[enemies] / 2
+        offset = centre - player.center
+        closest = np.argmin(np.einsum('ij,ij->i', offset, offset))
+        return tuple(centre[closest].astype(int).tolist())
+
+    def step(self, action, out=None):
+        """Advance one tick; returns (observation, reward, done, info).
+
+        The observation is written into out when given.
+        """
+        game = self.game
+        action = int(action)
+        picking = game.ability_system.selection_active
+        if picking:
+            frame = auto_pick(game)
+        elif action & ACTION_FIRE:
+            frame = self.make_frame(action, self.nearest_enemy())
+        else:
+            frame = self.frames[action]
+
+        score = game.score
+        game.step(frame)
+        self.ticks += 1
+        if picking and not game.ability_system.selection_active:
+            self.picked.extend(ability.name for ability in game.ability_system.abilities.values()
+                               if ability.unlocked and ability.name not in self.picked)
+
+        reward = float(game.score - score)
+        if game.game_over:
+            reward -= self.death_penalty
+        done = game.game_over or (self.max_ticks is not None and self.ticks >= self.max_ticks)
+        info = {'score': game.score, 'ticks': self.ticks, 'game_over': game.game_over}
+        return self.observation(out), reward, done, info
+
+    def observation(self, out=None):
+        """Pixel stack or compact vector, whichever this env observes"""
+        if self.pixels is None:
+            return self.observe(out)
+        self.game.draw()
+        return self.pixels.observe(self.game.screen, out)
+
+    def observe(self, out=None):
+        """Fill out (or a new float32 array) with the compact observation"""
+        if out is None:
+            out = np.zeros(OBS_SIZE, dtype=np.float32)
+        else:
+            out[:] = 0
+        game = self.game
+        width, height = game.WIDTH, game.HEIGHT
+        player = game.player
+        px, py = player.rect.center
+        out[0] = px / width
+        out[1] = py / height
+        out[2] = player.vel_y / 20
+        out[3] = player.on_platform
+        out[4] = game.ability_system.abilities['fireball'].unlocked
+
+        store = game.movers
+        n = len(store)
+        if not n:
+            return out
+        pos = store.pos[:n]
+        size = store.size[:n]
+        offset = (pos + size * 0.5 - (px, py)) / (width, height)
+        distance = (offset * offset).sum(1)
+        kind = store.kind[:n]
+
+        enemies = np.flatnonzero(kind == KIND_ENEMY)
+        enemies = enemies[np.argsort(distance[enemies])[:NEAREST_ENEMIES]]
+        block = self.enemy_block(out)
+        count = len(enemies)
+        block[:count, 0] = 1
+        block[:count, 1:3] = offset[enemies]
+        block[:count, 3:5] = store.vel[enemies] * 0.1
+
+        platforms = np.flatnonzero(kind == KIND_PLATFORM)
+        platforms = platforms[np.argsort(distance[platforms])[:NEAREST_PLATFORMS]]
+        block = self.platform_block(out)
+        count = len(platforms)
+        block[:count, 0] = 1
+        block[:count, 1:3] = offset[platforms]
+        block[:count, 3] = size[platforms, 0] / width
+        block[:count, 4] = store.vel[platforms, 0] * 0.1
+        return out
+
+    @staticmethod
+    def enemy_block(obs):
+        start = PLAYER_FEATURES
+        return obs[start:start + NEAREST_ENEMIES * ENTITY_FEATURES].reshape(
+            NEAREST_ENEMIES, ENTITY_FEATURES)
+
+    @staticmethod
+    def platform_block(obs):
+        start = PLAYER_FEATURES + NEAREST_ENEMIES * ENTITY_FEATURES
+        return obs[start:start + NEAREST_PLATFORMS * ENTITY_FEATURES].reshape(
+            NEAREST_PLATFORMS, ENTITY_FEATURES)
+
+
+class VectorEnv:
+    """N independent games stepped together.
+
+    Observations, rewards, done flags and running episode stats live in NumPy
+    arrays indexed by game. A game that finishes is reset straight away; its
+    final score and length are in info['final_score'] / info['final_ticks'] for
+    that step (-1 for games still running).
+    """
+
+    def __init__(self, num_envs, seed=None, **params):
+        seeds = random.Random(seed)
+        self.envs = [GoneRogueEnv(seed=seeds.getrandbits(32), **params)
+                     for _ in range(num_envs)]
+        self.num_envs = num_envs
+        first = self.envs[0]
+        self.obs = np.zeros((num_envs,) + first.observation_shape, dtype=first.observation_dtype)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.final_scores = np.full(num_envs, -1, dtype=np.int64)
+        self.final_ticks = np.full(num_envs, -1, dtype=np.int64)
+        self.episodes = 0
+
+    def reset(self):
+        for i, env in enumerate(self.envs):
+            self.obs[i] = env.reset()
+        self.scores[:] = 0
+        self.ticks[:] = 0
+        return self.obs
+
+    def step(self, actions):
+        """Step every game with its action; returns (obs, rewards, dones, info)"""
+        self.final_scores[:] = -1
+        self.final_ticks[:] = -1
+        for i, (env, action) in enumerate(zip(self.envs, np.asarray(actions).tolist())):
+            _, reward, done, info = env.step(action, self.obs[i])
+            self.rewards[i] = reward
+            self.dones[i] = done
+            if done:
+                self.final_scores[i] = info['score']
+                self.final_ticks[i] = info['ticks']
+                self.episodes += 1
+                self.obs[i] = env.reset()
+            self.scores[i] = env.game.score
+            self.ticks[i] = env.ticks
+        info = {'score': self.scores, 'ticks': self.ticks,
+                'final_score': self.final_scores, 'final_ticks': self.final_ticks}
+        return self.obs, self.rewards, self.dones, info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Step Gone Rogue games with random actions")
+    parser.add_argument('--envs', type=int, default=8)
+    parser.add_argument('--ticks', type=int, default=10000,
+                        help="ticks to run, per game")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--enemy-spawn-delay', type=int, default=None)
+    parser.add_argument('--platform-spawn-delay', type=int, default=None)
+    parser.add_argument('--unlock-times', type=int, nargs='+', default=None,
+                        help="sim milliseconds at which abilities unlock")
+    parser.add_argument('--pixels', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'), default=None,
+                        help="observe pooled screen frames of this size")
+    parser.add_argument('--pixel-mode', choices=('gray', 'palette'), default='gray')
+    parser.add_argument('--frame-stack', type=int, default=4)
+    args = parser.parse_args()
+
+    envs = VectorEnv(args.envs, args.seed, enemy_spawn_delay=args.enemy_spawn_delay,
+                     platform_spawn_delay=args.platform_spawn_delay,
+                     unlock_times=args.unlock_times, pixel_size=args.pixels,
+                     pixel_mode=args.pixel_mode, frame_stack=args.frame_stack)
+    envs.reset()
+    rng = np.random.default_rng(args.seed)
+    finished = []
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        _, _, dones, info = envs.step(rng.integers(0, NUM_ACTIONS, size=args.envs))
+        finished.extend(info['final_score'][dones].tolist())
+    elapsed = time.perf_counter() - start
+    total = args.ticks * args.envs
+    print(f"{total} ticks over {args.envs} games in {elapsed:.2f} s "
+          f"({total / elapsed:.0f} ticks/s), {len(finished)} episodes")
+    if finished:
+        print(f"episode score mean {np.mean(finished):.1f}, max {max(finished)}")
+    if args.pixels is not None:
+        observe_ms = np.mean([env.pixels.mean_ms() for env in envs.envs])
+        print(f"pixel observations {envs.obs.shape[1:]} cost {observe_ms:.2f} ms per frame "
+              f"(not counting the draw)")
+
+
+if __name__ == "__main__":
+    main()
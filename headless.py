@@ -0,0 +1,106 @@
+# headless.py
+"""Run the game simulation without a window, as fast as it will go.
+
+    python headless.py --ticks 10000 --seed 1
+"""
+import argparse
+import os
+import time
+
+# Must be set before pygame initializes its display
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+from inputs import InputFrame, InputRecorder, ScriptedInput
+from main import Game
+
+
+def auto_pick(game):
+    """Click the first ability on the unlock screen so the run keeps going"""
+    rects = game.ability_system.button_rects(len(game.ability_system.get_available_abilities()))
+    if rects:
+        return InputFrame.make(mouse_pos=rects[0].center, clicks=1)
+    return InputFrame()
+
+
+def run_headless(ticks=10000, seed=None, script=None, draw=False, pick_abilities=True,
+                 stop_on_game_over=True, game=None, record_path=None):
+    """Step a game for up to ticks sim steps and return throughput stats.
+
+    script is anything ScriptedInput accepts: a list of InputFrames or a
+    callable taking the tick number. The default script does nothing.
+    With record_path, the input actually fed to the game is saved for replay.py.
+    """
+    if game is None:
+        game = Game(headless=True)
+    game.init_game(player_name='headless', seed=seed)
+    if record_path is not None:
+        game.recorder = InputRecorder(game.seed)
+    source = ScriptedInput(script if script is not None else [])
+
+    start = time.perf_counter()
+    tick = 0
+    while tick < ticks:
+        frame = source.poll()
+        if pick_abilities and game.ability_system.selection_active and not frame.events:
+            frame = auto_pick(game)
+        if not game.step(frame):
+            break
+        if draw:
+            game.draw()
+            if game.capture is not None:
+                game.capture.grab(game.screen)
+        game.profiler.end_frame()
+        tick += 1
+        if stop_on_game_over and game.game_over:
+            break
+    elapsed = time.perf_counter() - start
+    if record_path is not None:
+        game.recorder.save(record_path, game.state_digest())
+        game.recorder = None
+
+    return {
+        'ticks': tick,
+        'seconds': elapsed,
+        'ticks_per_second': tick / elapsed if elapsed else 0.0,
+        'score': game.score,
+        'game_over': game.game_over,
+        'sim_time_ms': game.sim_time_ms(),
+        'seed': game.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Gone Rogue without a display")
+    parser.add_argument('--ticks', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--draw', action='store_true',
+                        help="also render every tick to the off-screen surface")
+    parser.add_argument('--keep-going', action='store_true',
+                        help="keep stepping after game over")
+    parser.add_argument('--record', metavar='PATH', default=None,
+                        help="save the run's input log for replay.py")
+    parser.add_argument('--profile', metavar='PATH', default=None,
+                        help="profile every tick and save the timings to PATH")
+    parser.add_argument('--capture', metavar='PATH', default=None,
+                        help="with --draw, record every tick to a video file or PNG directory")
+    args = parser.parse_args()
+
+    game = Game(headless=True)
+    if args.profile is not None:
+        game.profile_path = args.profile
+        game.profiler.toggle()
+    if args.capture is not None:
+        game.start_capture(args.capture)
+    stats = run_headless(args.ticks, args.seed, draw=args.draw,
+                         stop_on_game_over=not args.keep_going, game=game,
+                         record_path=args.record)
+    print(f"{stats['ticks']} ticks in {stats['seconds']:.2f} s "
+          f"({stats['ticks_per_second']:.0f} ticks/s), score {stats['score']}, "
+          f"game over: {stats['game_over']}")
+    game.shutdown()
+    if game.capture is not None:
+        print(game.capture.report())
+
+
+if __name__ == "__main__":
+    main()
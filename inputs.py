@@ -0,0 +1,160 @@
+# inputs.py
+import struct
+
+import pygame
+
+# Keys the simulation reads as held state; everything else arrives as events
+TRACKED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE,
+                pygame.K_a, pygame.K_d, pygame.K_w)
+
+
+class HeldKeys(frozenset):
+    """Set of held key codes that can be indexed like pygame.key.get_pressed()"""
+    def __getitem__(self, key):
+        return key in self
+
+
+class InputFrame:
+    """Everything the simulation reads from the player during one tick"""
+    __slots__ = ('keys', 'mouse_pos', 'events')
+
+    def __init__(self, keys=(), mouse_pos=(0, 0), events=()):
+        self.keys = keys if isinstance(keys, HeldKeys) else HeldKeys(keys)
+        self.mouse_pos = tuple(mouse_pos)
+        self.events = list(events)
+
+    @classmethod
+    def make(cls, keys=(), mouse_pos=(0, 0), clicks=0, keydowns=(), quit=False):
+        """Build a frame from plain values instead of pygame events"""
+        events = []
+        if quit:
+            events.append(pygame.event.Event(pygame.QUIT))
+        for _ in range(clicks):
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=tuple(mouse_pos)))
+        for key in keydowns:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=''))
+        return cls(keys, mouse_pos, events)
+
+
+class LiveInput:
+    """Reads the real keyboard and mouse through pygame"""
+    def poll(self):
+        pressed = pygame.key.get_pressed()
+        keys = HeldKeys(key for key in TRACKED_KEYS if pressed[key])
+        return InputFrame(keys, pygame.mouse.get_pos(), pygame.event.get())
+
+
+class ScriptedInput:
+    """Feeds pre-built frames, one per poll.
+
+    script is either a sequence of InputFrames or a callable taking the tick
+    number and returning one. Polling past the end of a sequence yields empty
+    frames.
+    """
+    def __init__(self, script):
+        self.script = script
+        self.tick = 0
+
+    def poll(self):
+        tick = self.tick
+        self.tick += 1
+        if callable(self.script):
+            return self.script(tick)
+        if tick < len(self.script):
+            return self.script[tick]
+        return InputFrame()
+
+
+# Input log format: a header, then runs of identical ticks, then a state digest.
+# Held keys are a bitmask over TRACKED_KEYS; only the event types the game
+# reacts to (quit, mouse click, key press) are stored.
+LOG_MAGIC = b'GRIN'
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct('<4sHQI')  # magic, version, seed, tick count
+LOG_RUN = struct.Struct('<HBhhB')  # repeat, key mask, mouse x, mouse y, event count
+LOG_EVENT = struct.Struct('<Bi')  # event kind, key code
+LOG_DIGEST = struct.Struct('<B')  # digest length, followed by the digest bytes
+SEED_MASK = 2 ** 64 - 1  # Seeds are stored as 64-bit unsigned
+
+EVENT_QUIT = 0
+EVENT_CLICK = 1
+EVENT_KEYDOWN = 2
+
+
+class InputRecorder:
+    """Collects the InputFrame of every sim tick into a compact binary log"""
+    def __init__(self, seed):
+        self.seed = seed
+        self.ticks = 0
+        self.runs = []
+
+    def record(self, frame):
+        mask = 0
+        for bit, key in enumerate(TRACKED_KEYS):
+            if key in frame.keys:
+                mask |= 1 << bit
+        events = []
+        for event in frame.events:
+            if event.type == pygame.QUIT:
+                events.append((EVENT_QUIT, 0))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                events.append((EVENT_CLICK, 0))
+            elif event.type == pygame.KEYDOWN:
+                events.append((EVENT_KEYDOWN, event.key))
+
+        self.ticks += 1
+        x, y = frame.mouse_pos
+        if self.runs and not events:
+            last = self.runs[-1]
+            # Ticks without events that look like the previous one share a run
+            if not last[4] and last[1:4] == [mask, x, y] and last[0] < 0xFFFF:
+                last[0] += 1
+                return
+        self.runs.append([1, mask, x, y, events])
+
+    def to_bytes(self, digest=b''):
+        chunks = [LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, self.seed, self.ticks)]
+        for repeat, mask, x, y, events in self.runs:
+            chunks.append(LOG_RUN.pack(repeat, mask, x, y, len(events)))
+            for kind, key in events:
+                chunks.append(LOG_EVENT.pack(kind, key))
+        chunks.append(LOG_DIGEST.pack(len(digest)) + digest)
+        return b''.join(chunks)
+
+    def save(self, path, digest=b''):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(digest))
+
+
+def read_input_log(path):
+    """Load a recorded session; returns (seed, list of InputFrames, state digest)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    magic, version, seed, ticks = LOG_HEADER.unpack_from(data, 0)
+    if magic != LOG_MAGIC or version != LOG_VERSION:
+        raise ValueError(f"{path} is not a version {LOG_VERSION} input log")
+    offset = LOG_HEADER.size
+
+    frames = []
+    while len(frames) < ticks:
+        repeat, mask, x, y, count = LOG_RUN.unpack_from(data, offset)
+        offset += LOG_RUN.size
+        keys = HeldKeys(key for bit, key in enumerate(TRACKED_KEYS) if mask & (1 << bit))
+        events = []
+        for _ in range(count):
+            kind, key = LOG_EVENT.unpack_from(data, offset)
+            offset += LOG_EVENT.size
+            if kind == EVENT_QUIT:
+                events.append(pygame.event.Event(pygame.QUIT))
+            elif kind == EVENT_CLICK:
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(x, y)))
+            else:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=''))
+        frames.append(InputFrame(keys, (x, y), events))
+        # Repeated ticks never carry events, so they can share the frame
+        frames.extend([InputFrame(keys, (x, y))] * (repeat - 1))
+
+    (length,) = LOG_DIGEST.unpack_from(data, offset)
+    offset += LOG_DIGEST.size
+    return seed, frames, data[offset:offset + length]
@@ -0,0 +1,114 @@
+# leaderboard.py
+import bisect
+import json
+import os
+import tempfile
+import threading
+
+
+class LeaderboardStore:
+    """Highscores kept in memory and written to disk off the render thread.
+
+    A sorted index of (-score, name) keys is kept next to the dict, so top()
+    is a slice and rank() is a binary search instead of a full sort per call.
+
+    Scores are loaded once. submit() only touches the in-memory dict and wakes
+    the writer thread; any number of submits before the writer gets to run are
+    coalesced into a single atomic write (temp file plus rename).
+    """
+
+    def __init__(self, path='highscores.json'):
+        self.path = path
+        self.scores = self.load()
+        self.ranking = sorted((-score, name) for name, score in self.scores.items())
+        self.writes = 0
+
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._dirty = False
+        self._closing = False
+        self._writer = None
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            print(f"Could not read {self.path}, starting with an empty leaderboard.")
+            return {}
+
+    def get(self, name):
+        return self.scores.get(name, 0)
+
+    def top(self, limit=3):
+        """Return the best (name, score) pairs, highest first"""
+        return [(name, -neg_score) for neg_score, name in self.ranking[:limit]]
+
+    def rank(self, name):
+        """Return the 1-based position of a player, or None if they have no score"""
+        if name not in self.scores:
+            return None
+        return bisect.bisect_left(self.ranking, (-self.scores[name], name)) + 1
+
+    def __len__(self):
+        return len(self.scores)
+
+    def submit(self, name, score):
+        """Record a score, keeping only the best one per name. Returns True if it changed"""
+        with self._lock:
+            if name in self.scores:
+                if score <= self.scores[name]:
+                    return False
+                old_key = (-self.scores[name], name)
+                del self.ranking[bisect.bisect_left(self.ranking, old_key)]
+            self.scores[name] = score
+            bisect.insort(self.ranking, (-score, name))
+            self._dirty = True
+            self._ensure_writer()
+            self._wake.notify()
+        return True
+
+    def close(self):
+        """Flush any pending write and stop the writer thread"""
+        with self._lock:
+            self._closing = True
+            self._wake.notify()
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop,
+                                            name='leaderboard-writer', daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closing:
+                    self._wake.wait()
+                if not self._dirty:
+                    return
+                snapshot = dict(self.scores)
+                self._dirty = False
+            self._write(snapshot)
+
+    def _write(self, snapshot):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.highscores-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.writes += 1
+        except OSError as e:
+            print(f"Could not save highscores: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -1,42 +1,74 @@
 # main.py
+import time
+LAUNCH_TIME = time.perf_counter()  # For the time-to-first-frame report
+
 import pygame
+import argparse
+import hashlib
 import random
 import os
 
+from assets import assets
+from capture import FrameCapture
 from matrix_rain import MatrixRain
-from enemy import Enemy
-from platforms import Platform, StartPlatform  # Updated import
+from enemy import Enemy, enemy_pool
+from entities import KIND_ENEMY, KIND_PLATFORM, EntityStore
+from inputs import SEED_MASK, InputFrame, InputRecorder, LiveInput
+from pool import pool_stats
+from platforms import Platform, StartPlatform, platform_pool  # Updated import
+from profiler import FrameProfiler
+from render import DirtyRects, RenderQueue
+from snapshot import restore_snapshot, take_snapshot
+from spatial import SpatialHash
 from startscreen import StartupScreen
-from player import Player, Fireball
+from text_render import renderer
+from player import Player, Fireball, ProjectileSprites, fireball_pool
 from upgrade import MatrixAbilitySystem
 
 class StartPlatform(Platform):
-    def __init__(self, screen_width):
-        super().__init__(screen_width)
+    def __init__(self, screen_width, rng=random):
+        super().__init__(screen_width, rng)
         self.rect.centerx = screen_width // 2
         self.rect.y = 500  # Position slightly higher
         self.speed = 0
         self.has_jumped = False
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, headless=False, seed=None):
+        # Headless games render to an off-screen dummy display and stay quiet
+        self.headless = headless
+        self.verbose = not headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        # Only the modules the game uses; no audio or joystick
+        pygame.display.init()
+        pygame.font.init()
         self.WIDTH = 800
         self.HEIGHT = 600
+        self.FIREBALL_ANGLE_BUCKETS = 64
+        self.COLLISION_CELL_SIZE = 64
+        
+        # Fixed-timestep loop settings: the simulation always advances in
+        # 1/SIM_RATE steps, however fast or slow frames are rendered
+        self.SIM_RATE = 60
+        self.RENDER_FPS = 60  # Render cap; 0 renders as fast as possible
+        self.MAX_CATCH_UP_STEPS = 5  # Sim steps allowed per rendered frame
+        self.MAX_FRAME_SKIP = 2  # Frames that may go unrendered while catching up
+        self.MAX_FRAME_TIME = 0.25  # Longer stalls are clamped (seconds)
+        self.INTERPOLATION_SNAP = 64  # Moves longer than this (px) are not smoothed
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Matrix Jump Game")
         self.clock = pygame.time.Clock()
+        # Only display and font are initialized, which leaves SDL's timer off
+        # and get_ticks() stuck at 0; the first tick starts it, before the
+        # ability system reads it for its start time
+        self.clock.tick()
         
-        # Load sprite sheets
-        try:
-            self.walk_sprite_sheet = pygame.image.load("Walk.png")
-            self.idle_sprite_sheet = pygame.image.load("Idle.png")
-            self.punch_sprite_sheet = pygame.image.load( "Attack.png")
-            self.fire_image = pygame.image.load("fire.png")
-        except pygame.error as e:
-            print(f"Error loading images: {e}")
-            pygame.quit()
-            return
+        # Images decode in the background while the title screen animates;
+        # load_assets() finishes them on the main thread when play starts
+        assets.preload_async()
+        self.fireball_sprites = None
+        self.first_game_frame_time = None
         
         # Create sprite groups
         self.all_sprites = pygame.sprite.Group()
@@ -44,10 +76,38 @@ class Game:
         self.platforms = pygame.sprite.Group()
         self.fireballs = pygame.sprite.Group()
         
+        # Enemies and platforms are moved and culled as arrays
+        self.movers = EntityStore()
+        
+        # Broadphase grids, rebuilt every tick
+        self.platform_grid = SpatialHash(self.COLLISION_CELL_SIZE)
+        self.enemy_grid = SpatialHash(self.COLLISION_CELL_SIZE)
+        
         # Initialize game systems
         self.ability_system = MatrixAbilitySystem(self.screen)
         self.matrix_rain = MatrixRain(self.WIDTH, self.HEIGHT)
         self.startup = StartupScreen(self.screen, self.WIDTH, self.HEIGHT)
+        self.input_source = LiveInput()
+        
+        # Per-phase frame timings; off until toggled with F3 (F4 exports)
+        self.profiler = FrameProfiler()
+        self.profile_path = None
+        
+        # Sprites are queued by layer and drawn in one blits call per layer
+        self.render_queue = RenderQueue()
+        
+        # Set to a DirtyRects to redraw and present only what changed
+        self.dirty_rects = None
+        
+        # Set to a FrameCapture to record every presented frame
+        self.capture = None
+        
+        # All gameplay randomness comes from this seeded generator so a run
+        # can be replayed from its seed and input log
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.recorder = None
+        self.record_path = None
         
         # Game state
         self.player_name = None
@@ -55,6 +115,10 @@ class Game:
         self.score = 0
         self.game_over = False
         self.paused = False
+        self.score_saved = False
+        self.sim_ticks = 0
+        self.prev_positions = {}
+        self.render_alpha = 1.0
         
         # Spawn timers
         self.enemy_spawn_timer = 0
@@ -67,29 +131,62 @@ class Game:
         self.PLATFORM_SPAWN_HEIGHT_MAX = 500
         self.STARTING_PLATFORM_HEIGHT = 500
 
-    def init_game(self):
+    def load_assets(self):
+        """Convert and scale every image once; returns False if one is missing"""
+        if self.fireball_sprites is not None:
+            return True
+        try:
+            assets.preload()
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading images: {e}")
+            return False
+        if self.verbose:
+            for line in assets.report():
+                print(f"[assets] {line}")
+        self.walk_sprite_sheet = assets.get('walk')
+        self.idle_sprite_sheet = assets.get('idle')
+        self.punch_sprite_sheet = assets.get('punch')
+        self.fire_image = assets.get('fire')
+        self.fireball_sprites = ProjectileSprites(self.fire_image, buckets=self.FIREBALL_ANGLE_BUCKETS)
+        return True
+
+    def init_game(self, player_name=None, seed=None):
         """Initialize or reset the game state"""
-        # Show startup screen and get player name
-        self.player_name = self.startup.show()
-        if self.player_name is None:
+        # Show startup screen and get player name, unless one is given
+        if player_name is None:
+            player_name = self.startup.show()
+        self.player_name = player_name
+        if self.player_name is None or not self.load_assets():
             return False
+        
+        # Reseed so the run depends only on its seed and its input
+        if seed is not None:
+            self.seed = seed
+        if self.seed is None:
+            self.seed = random.getrandbits(32)
+        # Input logs and snapshots store the seed as 64-bit unsigned, so any
+        # int the command line accepts is folded into that range first
+        self.seed &= SEED_MASK
+        self.rng.seed(self.seed)
+        self.ability_system.reset()
             
         # Reset sprite groups
         self.all_sprites.empty()
         self.enemies.empty()
         self.platforms.empty()
         self.fireballs.empty()
+        self.movers.clear()
         
         # Create starting platform
-        initial_platform = StartPlatform(self.WIDTH)
-        initial_platform.rect.centerx = self.WIDTH // 2
-        initial_platform.rect.y = self.STARTING_PLATFORM_HEIGHT
+        initial_platform = self.make_start_platform()
         self.all_sprites.add(initial_platform)
         self.platforms.add(initial_platform)
+        self.movers.add(initial_platform, (initial_platform.speed, 0), KIND_PLATFORM)
 
         # Create player on starting platform
         self.player = Player(self.walk_sprite_sheet, self.idle_sprite_sheet, 
-                           self.punch_sprite_sheet)
+                           self.punch_sprite_sheet, self.rng)
+        self.player.clock = self.sim_time_ms
         self.player.rect.bottom = initial_platform.rect.top
         self.player.rect.centerx = initial_platform.rect.centerx
         self.player.all_sprites = self.all_sprites
@@ -99,26 +196,43 @@ class Game:
         self.score = 0
         self.game_over = False
         self.paused = False
+        self.score_saved = False
+        self.sim_ticks = 0
+        self.prev_positions = {}
         self.enemy_spawn_timer = 0
         self.platform_spawn_timer = 0
         
         return True
 
-    def handle_input(self):
-        for event in pygame.event.get():
+    def make_start_platform(self):
+        """The platform the player starts on, centred at STARTING_PLATFORM_HEIGHT"""
+        platform = StartPlatform(self.WIDTH, self.rng)
+        platform.rect.centerx = self.WIDTH // 2
+        platform.rect.y = self.STARTING_PLATFORM_HEIGHT
+        return platform
+
+    def handle_input(self, frame=None):
+        """Apply one tick of input; returns False when the player quits"""
+        if frame is None:
+            frame = self.input_source.poll()
+        mouse_pos = frame.mouse_pos
+        # Held keys are read by the player during update
+        self.player.controls = frame
+        
+        for event in frame.events:
             if event.type == pygame.QUIT:
                 return False
 
             if self.ability_system.selection_active:
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    selected_ability = self.ability_system.handle_selection(pygame.mouse.get_pos())
-                    if selected_ability:
+                    selected_ability = self.ability_system.handle_selection(mouse_pos)
+                    if selected_ability and self.verbose:
                         print(f"Unlocked: {selected_ability}")
                 continue
 
             if event.type == pygame.MOUSEBUTTONDOWN and self.ability_system.abilities['fireball'].unlocked:
-                mouse_pos = pygame.mouse.get_pos()
-                fireball = Fireball(self.player.rect.center, mouse_pos, self.fire_image)
+                fireball = fireball_pool.acquire(self.player.rect.center, mouse_pos,
+                                                 self.fireball_sprites)
                 self.fireballs.add(fireball)
                 self.all_sprites.add(fireball)
                 self.player.punch()
@@ -127,164 +241,386 @@ class Game:
                 if event.key == pygame.K_p and self.ability_system.abilities['doppelganger'].unlocked:
                     self.player.create_doppelganger()
                 elif event.key == pygame.K_t and self.ability_system.abilities['teleport'].unlocked:
-                    mouse_pos = pygame.mouse.get_pos()
                     self.player.trigger_teleport(mouse_pos)
 
         return True
 
+    def step(self, frame):
+        """Advance the simulation one tick with the given input"""
+        if self.recorder is not None:
+            self.recorder.record(frame)
+        if not self.handle_input(frame):
+            return False
+        self.update()
+        return True
+
 
     def spawn_enemies(self):
         """Handle enemy spawning"""
         self.enemy_spawn_timer += 1
         if self.enemy_spawn_timer >= self.enemy_spawn_delay:
             self.enemy_spawn_timer = 0
-            enemy = Enemy(self.WIDTH, self.HEIGHT)
+            enemy = enemy_pool.acquire(self.WIDTH, self.HEIGHT, self.rng)
             self.all_sprites.add(enemy)
             self.enemies.add(enemy)
+            self.movers.add(enemy, (enemy.vel_x, enemy.vel_y), KIND_ENEMY)
 
     def spawn_platforms(self):
         """Handle platform spawning"""
         self.platform_spawn_timer += 1
         if self.platform_spawn_timer >= self.platform_spawn_delay:
             self.platform_spawn_timer = 0
-            platform = Platform(self.WIDTH)
-            platform.rect.y = random.randint(self.PLATFORM_SPAWN_HEIGHT_MIN, 
+            platform = platform_pool.acquire(self.WIDTH, self.rng)
+            platform.rect.y = self.rng.randint(self.PLATFORM_SPAWN_HEIGHT_MIN, 
                                           self.PLATFORM_SPAWN_HEIGHT_MAX)
             self.all_sprites.add(platform)
             self.platforms.add(platform)
+            self.movers.add(platform, (platform.speed, 0), KIND_PLATFORM)
+
+    def commit_score(self):
+        """Submit the final score once per run"""
+        if not self.score_saved and not self.headless:
+            self.startup.save_highscore(self.player_name, self.score)
+            self.score_saved = True
+
+    def sim_time_ms(self):
+        """Milliseconds of simulated play since the run started"""
+        return self.sim_ticks * 1000 // self.SIM_RATE
 
     def update(self):
-        """Update game state"""
+        """Advance the simulation by one fixed step"""
+        # Remember where everything was so rendering can interpolate
+        self.prev_positions = {sprite: sprite.rect.topleft for sprite in self.all_sprites}
+        
         if not self.game_over and not self.paused:
+            self.sim_ticks += 1
+            
             # Spawn enemies and platforms
+            profiler = self.profiler
+            profiler.start('spawn')
             self.spawn_enemies()
             self.spawn_platforms()
+            profiler.stop('spawn')
             
             # Check for ability unlocks
-            if self.ability_system.check_unlock_time():
+            if self.ability_system.check_unlock_time(self.sim_time_ms()):
                 self.paused = False
                 
             # Update all sprites if not paused
             if not self.ability_system.selection_active:
+                profiler.start('update')
                 self.all_sprites.update()
+                self.movers.step()
                 self.player.teleport_distortions.update()
+                profiler.stop('update')
                 
-                # Handle platform collisions
-                self.player.handle_platform_collision(self.platforms)
+                # Rebuild the broadphase grids now that everything has moved
+                profiler.start('collisions')
+                self.platform_grid.build(self.platforms)
+                self.enemy_grid.build(self.enemies)
+                
+                # Handle platform collisions (inflated so touching edges still count)
+                self.player.handle_platform_collision(
+                    self.platform_grid.query(self.player.rect.inflate(2, 2)))
                 
                 # Check if player fell off screen
                 if self.player.rect.top > self.HEIGHT:
                     self.game_over = True
                 
                 # Check enemy collisions
-                if pygame.sprite.spritecollide(self.player, self.enemies, False):
+                if self.enemy_grid.collide(self.player):
                     if not self.player.shield_active:
                         self.game_over = False
                     
                 # Check fireball hits on enemies
                 for fireball in self.fireballs:
-                    enemies_hit = pygame.sprite.spritecollide(fireball, self.enemies, True)
+                    enemies_hit = self.enemy_grid.collide(fireball, True)
                     if enemies_hit:
                         fireball.kill()
                         self.score += 10  # Bonus points for hitting enemies
+                profiler.stop('collisions')
                 
                 # Update score
                 self.score += 1
                 
             # Clean up off-screen sprites
+            profiler.start('cleanup')
             self.cleanup_sprites()
+            profiler.stop('cleanup')
+
+        if self.game_over:
+            self.commit_score()
 
     def cleanup_sprites(self):
         """Remove sprites that have moved off screen"""
-        for sprite in self.platforms:
-            if (sprite.direction == -1 and sprite.rect.left > self.WIDTH) or \
-               (sprite.direction == 1 and sprite.rect.right < 0):
-                sprite.kill()
-        for enemy in self.enemies:
-            if (enemy.rect.right < 0 or enemy.rect.left > self.WIDTH or
-                enemy.rect.bottom < 0 or enemy.rect.top > self.HEIGHT):
-                enemy.kill()
+        self.movers.cull(self.WIDTH, self.HEIGHT)
         for fireball in self.fireballs:
             if (fireball.rect.right < 0 or fireball.rect.left > self.WIDTH or
                 fireball.rect.bottom < 0 or fireball.rect.top > self.HEIGHT):
                 fireball.kill()
 
+    def state_digest(self):
+        """Hash of the simulation state, used to check replays match bit for bit"""
+        digest = hashlib.sha256()
+        digest.update(repr((self.sim_ticks, self.score, self.game_over,
+                            self.enemy_spawn_timer, self.platform_spawn_timer)).encode())
+        digest.update(repr((self.player.rect, self.player.vel_y, self.player.on_platform,
+                            self.player.facing_right, self.player.current_frame)).encode())
+        for group in (self.platforms, self.enemies, self.fireballs):
+            digest.update(repr([tuple(sprite.rect) for sprite in group]).encode())
+        digest.update(self.movers.pos[:len(self.movers)].tobytes())
+        digest.update(repr([ability.unlocked for ability in self.ability_system.abilities.values()]).encode())
+        digest.update(repr(self.rng.getstate()).encode())
+        return digest.digest()
+
+    def snapshot(self):
+        """Compact binary copy of the run's state, for restore()"""
+        return take_snapshot(self)
+
+    def restore(self, data):
+        """Rewind or jump to a state saved by snapshot()"""
+        restore_snapshot(self, data)
+
+    def render_pos(self, sprite):
+        """Sprite position blended between the last two sim steps"""
+        x, y = sprite.rect.topleft
+        prev = self.prev_positions.get(sprite)
+        if prev is None:
+            return x, y
+        dx = x - prev[0]
+        dy = y - prev[1]
+        if abs(dx) > self.INTERPOLATION_SNAP or abs(dy) > self.INTERPOLATION_SNAP:
+            return x, y  # Teleports and respawns jump straight to the new spot
+        alpha = self.render_alpha
+        return prev[0] + dx * alpha, prev[1] + dy * alpha
+
     def draw(self):
         """Draw the game state"""
-        self.screen.fill((0, 0, 0))  # Black background
-        self.matrix_rain.draw(self.screen)
+        profiler = self.profiler
+        dirty = self.dirty_rects
+        collect = dirty is not None
+        profiler.start('rain')
+        if collect:
+            dirty.begin(self.screen)  # Blanks only what was drawn last frame
+        else:
+            self.screen.fill((0, 0, 0))  # Black background
+        rects = self.matrix_rain.draw(self.screen, collect)
+        profiler.stop('rain')
         
         if not self.game_over:
-            self.all_sprites.draw(self.screen)
-            self.player.teleport_distortions.draw(self.screen)
+            profiler.start('draw')
+            queue = self.render_queue
+            queue.add_sprites(self.all_sprites, self.render_pos)
+            queue.add_sprites(self.player.teleport_distortions)
+            sprite_rects = queue.flush(self.screen, collect)
+            profiler.stop('draw')
+            profiler.start('effects')
+            effect_rects = self.player.teleport_effects.draw(self.screen, collect)
+            profiler.stop('effects')
             
-            # Draw score
-            font = pygame.font.Font(None, 36)
-            score_text = font.render(f'Score: {self.score}', True, (0, 255, 0))
-            self.screen.blit(score_text, (10, 10))
+            # Draw score from the cached digit atlas
+            profiler.start('text')
+            score_rect = renderer.draw_number(self.screen, (10, 10), self.score, (0, 255, 0), 36,
+                                              prefix='Score: ')
+            profiler.stop('text')
+            
+            if collect:
+                dirty.add(rects)
+                dirty.add(sprite_rects)
+                dirty.add(effect_rects)
+                dirty.add(score_rect)
             
             if self.ability_system.selection_active:
+                profiler.start('unlock')
                 self.ability_system.draw_unlock_screen()
+                profiler.stop('unlock')
+                if collect:
+                    dirty.invalidate()
         else:
+            profiler.start('text')
             self.draw_game_over()
+            profiler.stop('text')
+            if collect:
+                dirty.invalidate()
+        
+        if profiler.enabled:
+            overlay_rect = profiler.draw(self.screen)
+            if collect:
+                dirty.add(overlay_rect)
+
+    def present(self):
+        """Push the frame to the display, only the changed areas when tracking them"""
+        if self.dirty_rects is None:
+            pygame.display.flip()
+        else:
+            self.dirty_rects.present()
 
     def draw_game_over(self):
         """Draw the game over screen"""
-        font_large = pygame.font.Font(None, 42)
-        font_small = pygame.font.Font(None, 23)
+        screen_center = self.WIDTH // 2
         
         # Draw game over text
-        game_over_text = font_large.render('Game Over', True, (255, 0, 0))
-        score_text = font_large.render(f'Your Score: {self.score}', True, (255, 255, 255))
-        
-        self.startup.save_highscore(self.player_name, self.score)
-        
-        screen_center = self.WIDTH // 2
-        self.screen.blit(game_over_text, 
-                        (screen_center - game_over_text.get_width()//2, self.HEIGHT//4))
-        self.screen.blit(score_text, 
-                        (screen_center - score_text.get_width()//2, self.HEIGHT//4 + 80))
+        renderer.draw_centered(self.screen, 'Game Over', (255, 0, 0),
+                               screen_center, self.HEIGHT//4, 42)
+        renderer.draw_centered(self.screen, f'Your Score: {self.score}', (255, 255, 255),
+                               screen_center, self.HEIGHT//4 + 80, 42)
         
         # Draw top scores
         top_scores = self.startup.get_top_scores(3)
-        title_text = font_small.render("Top Hackers:", True, (0, 255, 0))
-        self.screen.blit(title_text, 
-                        (screen_center - title_text.get_width()//2, self.HEIGHT//2 - 30))
+        renderer.draw_centered(self.screen, "Top Hackers:", (0, 255, 0),
+                               screen_center, self.HEIGHT//2 - 30, 23)
         
         for i, (name, highscore) in enumerate(top_scores):
             color = (0, 255, 0) if name == self.player_name and self.score == highscore else (255, 255, 255)
-            score_text = font_small.render(f"{i+1}. {name}: {highscore}", True, color)
             y_pos = self.HEIGHT//2 + (i * 45)
-            self.screen.blit(score_text, 
-                           (screen_center - score_text.get_width()//2, y_pos))
+            renderer.draw_centered(self.screen, f"{i+1}. {name}: {highscore}", color,
+                                   screen_center, y_pos, 23)
         
         # Draw restart prompts
-        play_again = font_small.render("Press ENTER to Play Again", True, (0, 255, 0))
-        exit_text = font_small.render("Press ESC to Quit", True, (0, 255, 0))
-        
-        self.screen.blit(play_again, 
-                        (screen_center - play_again.get_width()//2, self.HEIGHT - 120))
-        self.screen.blit(exit_text, 
-                        (screen_center - exit_text.get_width()//2, self.HEIGHT - 70))
+        renderer.draw_centered(self.screen, "Press ENTER to Play Again", (0, 255, 0),
+                               screen_center, self.HEIGHT - 120, 23)
+        renderer.draw_centered(self.screen, "Press ESC to Quit", (0, 255, 0),
+                               screen_center, self.HEIGHT - 70, 23)
 
-    def run(self):
-        """Main game loop"""
+    def run(self, record_path=None):
+        """Main game loop; optionally records the session's input to record_path"""
         if not self.init_game():
             return
+        self.record_path = record_path
+        if record_path is not None:
+            self.recorder = InputRecorder(self.seed)
             
+        step = 1.0 / self.SIM_RATE
+        accumulator = 0.0
+        frames_skipped = 0
+        previous = time.perf_counter()
+        
+        pending_events = []
         running = True
         while running:
-            running = self.handle_input()
+            now = time.perf_counter()
+            accumulator += min(now - previous, self.MAX_FRAME_TIME)
+            previous = now
+            
+            # Input is polled once per rendered frame; its events are applied
+            # on the next sim step, held keys on every step
+            self.profiler.start('input')
+            frame = self.input_source.poll()
+            self.handle_debug_keys(frame.events)
+            pending_events.extend(frame.events)
+            self.profiler.stop('input')
+            
+            # Run as many fixed steps as the elapsed time calls for
+            steps = 0
+            while accumulator >= step and steps < self.MAX_CATCH_UP_STEPS:
+                running = self.step(InputFrame(frame.keys, frame.mouse_pos, pending_events))
+                pending_events = []
+                if not running:
+                    break
+                accumulator -= step
+                steps += 1
             if not running:
                 break
-                
-            self.update()
+            
+            # Still behind: skip drawing this frame to catch up, within limits
+            if accumulator >= step and frames_skipped < self.MAX_FRAME_SKIP:
+                frames_skipped += 1
+                continue
+            frames_skipped = 0
+            # Too far behind to catch up; drop the backlog (the game slows down)
+            accumulator = min(accumulator, step)
+            
+            self.render_alpha = accumulator / step
             self.draw()
-            pygame.display.flip()
-            self.clock.tick(60)
+            self.profiler.start('flip')
+            self.present()
+            self.profiler.stop('flip')
+            if self.capture is not None:
+                self.profiler.start('capture')
+                self.capture.grab(self.screen)
+                self.profiler.stop('capture')
+            self.profiler.end_frame()
+            if self.first_game_frame_time is None:
+                self.first_game_frame_time = time.perf_counter()
+                self.report_startup()
+            self.clock.tick(self.RENDER_FPS)
         
+        self.shutdown()
+
+    def report_startup(self):
+        """Print how long launch took to reach the title screen and the first game frame"""
+        if not self.verbose:
+            return
+        title = self.startup.first_frame_time
+        if title is not None:
+            print(f"[startup] title screen after {(title - LAUNCH_TIME) * 1000:.0f} ms")
+        decode_ms = sum(stat['decode_ms'] for stat in assets.stats.values())
+        print(f"[startup] first game frame after {(self.first_game_frame_time - LAUNCH_TIME) * 1000:.0f} ms "
+              f"({decode_ms:.0f} ms of image decoding done in the background)")
+
+    def handle_debug_keys(self, events):
+        """Profiler hotkeys; these never reach the simulation or the input log"""
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_F3:
+                self.profiler.toggle()
+            elif event.key == pygame.K_F4 and self.profiler.frames:
+                path = self.profile_path or time.strftime('profile-%Y%m%d-%H%M%S.jsonl')
+                count = self.profiler.export(path)
+                if self.verbose:
+                    print(f"Wrote {count} profiled frames to {path}")
+        events[:] = [event for event in events
+                     if not (event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4))]
+
+    def use_dirty_rects(self, enabled=True):
+        """Switch between full-screen flips and dirty-rectangle updates"""
+        self.dirty_rects = DirtyRects((self.WIDTH, self.HEIGHT)) if enabled else None
+
+    def start_capture(self, path):
+        """Record every presented frame to a video file or a PNG directory"""
+        self.capture = FrameCapture(path, (self.WIDTH, self.HEIGHT), self.RENDER_FPS or self.SIM_RATE)
+        # Start now so a missing encoder fails at launch, not mid-run
+        self.capture.start(self.screen)
+
+    def shutdown(self):
+        if self.capture is not None:
+            self.capture.close()
+            if self.verbose:
+                print(f"[capture] {self.capture.report()}")
+        if self.dirty_rects is not None and self.verbose:
+            print(f"[render] dirty rects covered {self.dirty_rects.coverage():.1%} of the screen "
+                  f"per frame, {self.dirty_rects.full_frames} full frames")
+        if self.profile_path is not None and self.profiler.frames:
+            self.profiler.export(self.profile_path)
+        if self.recorder is not None and self.record_path is not None:
+            self.recorder.save(self.record_path, self.state_digest())
+            if self.verbose:
+                print(f"Recorded {self.recorder.ticks} ticks to {self.record_path}")
+        self.startup.leaderboard.close()
+        if self.verbose:
+            for name, stats in pool_stats().items():
+                print(f"[pool] {name}: {stats['hits']} hits, {stats['misses']} misses, "
+                      f"{stats['free']} free")
         pygame.quit()
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Matrix Jump Game")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--record', metavar='PATH', default=None,
+                        help="record this session's input for replay.py")
+    parser.add_argument('--profile', metavar='PATH', default=None,
+                        help="start with the frame profiler on and save it to PATH on exit")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="update only the changed parts of the screen each frame")
+    parser.add_argument('--capture', metavar='PATH', default=None,
+                        help="record the screen to a video file (needs ffmpeg) or a PNG directory")
+    args = parser.parse_args()
+    game = Game(seed=args.seed)
+    game.use_dirty_rects(args.dirty_rects)
+    if args.capture is not None:
+        game.start_capture(args.capture)
+    if args.profile is not None:
+        game.profile_path = args.profile
+        game.profiler.toggle()
+    game.run(record_path=args.record)
\ No newline at end of file
@@ -1,29 +1,55 @@
 import pygame
-import random
+import numpy as np
 
 # Colors
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
 
+class GlyphAtlas:
+    """Every (character, color) combination rendered once up front"""
+    def __init__(self, font, chars, colors):
+        self.glyphs = [font.render(char, True, color) for color in colors for char in chars]
+
+    def __len__(self):
+        return len(self.glyphs)
+
+    def pick(self, rng, count):
+        """Return count random glyphs"""
+        glyphs = self.glyphs
+        return [glyphs[i] for i in rng.integers(0, len(glyphs), size=count).tolist()]
+
 class MatrixRain:
-    def __init__(self, width, height, font_size=20, speed=5):
+    def __init__(self, width, height, font_size=20, speed=5, streams_per_row=1, seed=None):
         self.width = width
         self.height = height
         self.font_size = font_size
         self.speed = speed
         self.font = pygame.font.Font(None, font_size)
-        
-        # Create raindrop rows instead of columns
-        self.rows = [random.randint(-width, 0) for _ in range(height // font_size)]
-    
-    def draw(self, screen):
-        for i in range(len(self.rows)):
-            y = i * self.font_size
-            x = self.rows[i]
-            text = self.font.render(str(random.choice([0, 1])), True, GREEN)
-            screen.blit(text, (x, y))
-            self.rows[i] += self.speed
-            
-            # Reset row when reaching right edge
-            if self.rows[i] > self.width:
-                self.rows[i] = random.randint(-50, 0)
\ No newline at end of file
+        self.rng = np.random.default_rng(seed)
+
+        # Only "0" and "1" are ever drawn, so render them once
+        self.atlas = GlyphAtlas(self.font, "01", [GREEN])
+
+        # Raindrop rows instead of columns; each row can carry several streams
+        num_rows = height // font_size
+        self.rows = self.rng.integers(-width, 1, size=(num_rows, streams_per_row)).astype(float)
+        if streams_per_row > 1:
+            # Spread extra streams across the row so the screen fills immediately
+            self.rows += np.arange(streams_per_row) * (width + 50) / streams_per_row
+        self.row_y = np.repeat(np.arange(num_rows) * font_size, streams_per_row).tolist()
+
+    def update(self):
+        """Advance every drop and reset the ones past the right edge"""
+        self.rows += self.speed
+        wrapped = self.rows > self.width
+        count = np.count_nonzero(wrapped)
+        if count:
+            self.rows[wrapped] = self.rng.integers(-50, 1, size=count)
+
+    def draw(self, screen, doreturn=False):
+        """Draw one frame of rain; with doreturn, returns the rects drawn"""
+        positions = zip(self.rows.ravel().tolist(), self.row_y)
+        rects = screen.blits(list(zip(self.atlas.pick(self.rng, self.rows.size), positions)),
+                             doreturn=doreturn)
+        self.update()
+        return rects
@@ -0,0 +1,149 @@
+# pixels.py
+import time
+
+import numpy as np
+import pygame
+
+# ITU-R BT.601 luma weights for (R, G, B), in 1/256ths
+LUMA_WEIGHTS = (77, 150, 29)
+
+# Colours the game mostly draws with; palette mode maps each pooled pixel to
+# the index of the nearest one
+DEFAULT_PALETTE = (
+    (0, 0, 0),        # Background
+    (0, 90, 0),       # Faded rain
+    (0, 255, 0),      # Rain, text and shield
+    (255, 255, 255),  # Bright glyphs and text
+    (200, 40, 40),    # Warm sprite colours
+    (40, 90, 200),    # Cool sprite colours
+    (128, 128, 128),  # Neutral sprite colours
+)
+
+
+class PixelObserver:
+    """Small grayscale or palette-index views of the screen for agents.
+
+    observe() reads the screen through a surfarray view of its 32-bit pixels
+    (the 800x600 frame is never converted as a whole) and average-pools it
+    down to size: output cells start on an even grid and each averages the
+    same block size (the source size divided by the output size, rounded
+    down), so at most one row or column per cell is skipped. Red and blue
+    are summed together as two 16-bit lanes of each pixel word, so the whole
+    pass is a few integer array operations.
+
+    The pooled colour becomes a grayscale value (mode='gray', 0-255) or the
+    index of the nearest palette colour (mode='palette'), and the frame is
+    pushed onto a stack of the last `stack` frames, shaped
+    (stack, height, width) in uint8.
+
+    Every call is timed; mean_ms() is the pipeline's cost per frame to budget
+    against the 16 ms frame (see `python benchmark.py pixels`).
+    """
+
+    def __init__(self, source_size, size=(84, 84), mode='gray', stack=4,
+                 palette=DEFAULT_PALETTE):
+        if mode not in ('gray', 'palette'):
+            raise ValueError(f"unknown pixel observation mode {mode!r}")
+        source_width, source_height = source_size
+        width, height = size
+        block_width = source_width // width
+        block_height = source_height // height
+        # A lane holds at most 65535, so a column of the block can't exceed 257 pixels
+        if not (block_width >= 1 and 1 <= block_height <= 257):
+            raise ValueError(f"cannot pool {source_size} down to {size}")
+        self.size = size
+        self.mode = mode
+        self.block_area = block_width * block_height
+
+        # Source rows and columns read for each output cell
+        x_starts = np.linspace(0, source_width, width + 1).astype(np.intp)[:-1]
+        y_starts = np.linspace(0, source_height, height + 1).astype(np.intp)[:-1]
+        self.columns = x_starts[:, None] + np.arange(block_width)
+        self.rows = y_starts[:, None] + np.arange(block_height)
+
+        palette = np.array(palette, dtype=np.float32)
+        self.palette = palette.T * -2  # Nearest colour minimizes |p|^2 - 2 c.p
+        self.palette_norms = (palette * palette).sum(1)
+        self.frames = np.zeros((stack, height, width), dtype=np.uint8)
+
+        self.rows_buffer = np.empty(self.rows.shape + (source_width,), dtype=np.uint32)
+        self.masked_buffer = np.empty_like(self.rows_buffer)
+        self.red_blue_buffer = np.empty((height, source_width), dtype=np.uint32)
+        self.green_buffer = np.empty_like(self.red_blue_buffer)
+
+        self.calls = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+
+    @property
+    def shape(self):
+        return self.frames.shape
+
+    def reset(self):
+        self.frames[:] = 0
+
+    @staticmethod
+    def lanes_of(surface):
+        """Shift of the red channel in surface's pixel words (16 or 0)"""
+        if surface.get_bytesize() != 4:
+            raise ValueError("pixel observations need a 32-bit surface")
+        rshift, gshift, bshift, _ = surface.get_shifts()
+        if gshift != 8 or {rshift, bshift} != {0, 16}:
+            raise ValueError(f"unsupported pixel shifts {surface.get_shifts()}")
+        return rshift
+
+    def pool(self, surface):
+        """Mean (R, G, B) of each output cell, each shaped (height, width)"""
+        rshift = self.lanes_of(surface)
+        rows, masked = self.rows_buffer, self.masked_buffer
+        red_blue, green = self.red_blue_buffer, self.green_buffer
+        # pixels2d is indexed [x, y]; the transpose is the buffer's row-major
+        # layout, and taking the blocks' rows copies just those. Every
+        # full-width step writes into buffers kept between calls, since fresh
+        # megabyte temporaries cost more in page faults than in arithmetic.
+        view = pygame.surfarray.pixels2d(surface).T
+        np.take(view, self.rows, axis=0, out=rows)  # (height, block height, source width)
+        del view  # Unlocks the surface
+        np.bitwise_and(rows, 0xff00ff, out=masked)
+        masked.sum(1, out=red_blue)
+        np.bitwise_and(rows, 0x00ff00, out=masked)
+        masked.sum(1, out=green)
+
+        # Split the lanes before summing across columns, which could overflow them
+        columns = self.columns
+        high = (red_blue >> 16)[:, columns].sum(2)
+        low = (red_blue & 0xffff)[:, columns].sum(2)
+        green = (green >> 8)[:, columns].sum(2)
+        red, blue = (high, low) if rshift == 16 else (low, high)
+        area = self.block_area
+        return red // area, green // area, blue // area
+
+    def convert(self, red, green, blue):
+        """Pooled channels to one uint8 per cell"""
+        if self.mode == 'gray':
+            r, g, b = LUMA_WEIGHTS
+            return ((red * r + green * g + blue * b) >> 8).astype(np.uint8)
+        colours = np.stack((red, green, blue), axis=-1).astype(np.float32)
+        distance = colours @ self.palette + self.palette_norms
+        return distance.argmin(axis=-1).astype(np.uint8)
+
+    def observe(self, surface, out=None):
+        """Push the current screen onto the stack and return the stack.
+
+        The stack is copied into out when given; otherwise the returned
+        array is the observer's own and changes on the next call.
+        """
+        start = time.perf_counter()
+        frames = self.frames
+        frames[:-1] = frames[1:]
+        frames[-1] = self.convert(*self.pool(surface))
+        if out is not None:
+            out[:] = frames
+        elapsed = (time.perf_counter() - start) * 1000
+        self.calls += 1
+        self.total_ms += elapsed
+        self.last_ms = elapsed
+        return frames if out is None else out
+
+    def mean_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
@@ -3,25 +3,27 @@ import pygame
 import random
 import os
 
-class Platform(pygame.sprite.Sprite):
-    def __init__(self, screen_width):
+from assets import assets
+from entities import StoredSprite
+from pool import SpritePool
+from render import LAYER_PLATFORMS
+
+class Platform(StoredSprite):
+    _layer = LAYER_PLATFORMS
+
+    def __init__(self, screen_width, rng=random):
         super().__init__()
-        # Load and scale the platform image
-        try:
-            # Try to load the platform image
-            self.image = pygame.image.load("assets/server.png").convert_alpha()
-            # Scale the image to desired size
-            self.image = pygame.transform.scale(self.image, (100, 20))  # Adjust size as needed
-        except pygame.error:
-            # Fallback to rectangle if image loading fails
-            print("Platform image not found. Using default rectangle.")
-            self.image = pygame.Surface((100, 20))
-            self.image.fill((255, 255, 255))
+        self.reset(screen_width, rng)
+
+    def reset(self, screen_width, rng=random):
+        """Set up a new or recycled platform; rng is the game's random source"""
+        # Platform image is loaded and scaled once and shared by every platform
+        self.image = assets.get('server.png')
             
         self.rect = self.image.get_rect()
         
         # Randomly choose starting side
-        self.direction = random.choice([-1, 1])  # -1 for left to right, 1 for right to left
+        self.direction = rng.choice([-1, 1])  # -1 for left to right, 1 for right to left
         
         # Set initial position
         if self.direction == -1:  # Start from left
@@ -32,16 +34,15 @@ class Platform(pygame.sprite.Sprite):
             self.speed = -2  # Move left
             
         # Random vertical position between top and bottom of screen
-        self.rect.y = random.randint(100, 500)
-        
-    def update(self):
-        # Move horizontally
-        self.rect.x += self.speed
+        self.rect.y = rng.randint(100, 500)
 
 class StartPlatform(Platform):
-    def __init__(self, screen_width):
-        super().__init__(screen_width)
+    def __init__(self, screen_width, rng=random):
+        super().__init__(screen_width, rng)
         self.rect.centerx = screen_width // 2
         self.rect.y = 500  # Position slightly higher
         self.speed = 0
-        self.has_jumped = False
\ No newline at end of file
+        self.has_jumped = False
+
+
+platform_pool = SpritePool(Platform)
@@ -3,16 +3,27 @@ import pygame
 import random
 import math
 from platforms import StartPlatform  # Add this import
+from particles import ParticleSystem
+from pool import PooledSprite, SpritePool
+from render import LAYER_EFFECTS, LAYER_PLAYER, LAYER_PROJECTILES
 
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, walk_sprite_sheet, idle_sprite_sheet, punch_sprite_sheet):
+    _layer = LAYER_PLAYER
+
+    def __init__(self, walk_sprite_sheet, idle_sprite_sheet, punch_sprite_sheet, rng=random):
         super().__init__()
         
-        # Load sprite sheets
-        self.walk_frames = self.load_frames(walk_sprite_sheet, 10)
-        self.idle_frames = self.load_frames(idle_sprite_sheet, 6)
-        self.punch_frames = self.load_frames(punch_sprite_sheet, 4)
+        # Load sprite sheets into a frame bank keyed by animation and facing
+        # direction (True = right), so animating never flips at runtime
+        self.frame_bank = {
+            'walk': self.load_frames(walk_sprite_sheet, 10),
+            'idle': self.load_frames(idle_sprite_sheet, 6),
+            'punch': self.load_frames(punch_sprite_sheet, 4),
+        }
+        self.walk_frames = self.frame_bank['walk'][True]
+        self.idle_frames = self.frame_bank['idle'][True]
+        self.punch_frames = self.frame_bank['punch'][True]
         
         # Initialize sprite state
         self.current_frame = 0
@@ -70,24 +81,33 @@ class Player(pygame.sprite.Sprite):
         self.control_duration = 5000
         self.control_start_time = 0
         
-        # Special effects groups
-        self.teleport_effects = pygame.sprite.Group()
+        # Special effects; particles live in arrays rather than sprites
+        self.teleport_effects = ParticleSystem(seed=rng.getrandbits(32))
         
         # Doppelganger
         self.doppelganger = None
         self.all_sprites = None
 
+        # Input for the current tick (an inputs.InputFrame), set by the game;
+        # falls back to the live keyboard when nothing has been set
+        self.controls = None
+
+        # Ability timers read this clock (ms); the game points it at sim time
+        self.clock = pygame.time.get_ticks
+
         self.on_platform = False
 
 
     def load_frames(self, sprite_sheet, num_frames):
+        """Slice a sprite sheet and return {facing_right: frames} for both directions"""
         frames = []
         frame_width = sprite_sheet.get_width() // num_frames
         frame_height = sprite_sheet.get_height()
         for i in range(num_frames):
             frame = sprite_sheet.subsurface(i * frame_width, 0, frame_width, frame_height)
             frames.append(frame)
-        return frames
+        mirrored = [pygame.transform.flip(frame, True, False) for frame in frames]
+        return {True: frames, False: mirrored}
 
     def update(self):
         if self.is_teleporting:
@@ -101,10 +121,11 @@ class Player(pygame.sprite.Sprite):
         self.teleport_effects.update()
         self.teleport_distortions.update()
         if self.doppelganger:
+            self.doppelganger.controls = self.controls
             self.doppelganger.update()
 
     def normal_update(self):
-        keys = pygame.key.get_pressed()
+        keys = self.controls.keys if self.controls is not None else pygame.key.get_pressed()
         self.moving = False
 
         if keys[pygame.K_LEFT]:
@@ -137,17 +158,11 @@ class Player(pygame.sprite.Sprite):
 
     def animate_walk(self):
         self.current_frame = (self.current_frame + 1) % len(self.walk_frames)
-        frame = self.walk_frames[self.current_frame]
-        if not self.facing_right:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame
+        self.image = self.frame_bank['walk'][self.facing_right][self.current_frame]
 
     def animate_idle(self):
         self.current_frame = (self.current_frame + 1) % len(self.idle_frames)
-        frame = self.idle_frames[self.current_frame]
-        if not self.facing_right:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame
+        self.image = self.frame_bank['idle'][self.facing_right][self.current_frame]
 
     def animate_punch(self):
         self.animation_timer += 1
@@ -158,10 +173,7 @@ class Player(pygame.sprite.Sprite):
                 self.punching = False
             self.animation_timer = 0
         
-        frame = self.punch_frames[self.current_frame]
-        if not self.facing_right:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame
+        self.image = self.frame_bank['punch'][self.facing_right][self.current_frame]
 
     def punch(self):
         self.punching = True
@@ -185,14 +197,15 @@ class Player(pygame.sprite.Sprite):
 
     def create_doppelganger(self):
         if not self.doppelganger and self.all_sprites is not None:
-            self.doppelganger = Doppelganger(self.walk_frames)
+            self.doppelganger = Doppelganger(self.frame_bank['walk'])
+            self.doppelganger.controls = self.controls
             self.doppelganger.rect.center = (self.rect.centerx + 100, self.rect.centery)
             self.all_sprites.add(self.doppelganger)
 
     def activate_time_slow(self):
         if not self.time_slow_active:
             self.time_slow_active = True
-            self.time_slow_start = pygame.time.get_ticks()
+            self.time_slow_start = self.clock()
             for sprite in self.all_sprites:
                 if sprite != self:
                     sprite.vel_x *= self.time_slow_factor
@@ -200,12 +213,12 @@ class Player(pygame.sprite.Sprite):
 
     def activate_matrix_vision(self):
         self.matrix_vision_active = True
-        self.matrix_vision_start = pygame.time.get_ticks()
+        self.matrix_vision_start = self.clock()
 
     def wall_run(self):
         if self.is_near_wall() and not self.wall_running:
             self.wall_running = True
-            self.wall_run_timer = pygame.time.get_ticks()
+            self.wall_run_timer = self.clock()
             self.gravity = 0
 
     def activate_shield(self):
@@ -213,6 +226,8 @@ class Player(pygame.sprite.Sprite):
             self.shield_active = True
             self.shield_health = 100
             shield_surface = self.create_shield_effect()
+            # Frames are shared with the sprite sheet, so draw on a copy
+            self.image = self.image.copy()
             self.image.blit(shield_surface, (0, 0))
 
     def create_shield_effect(self):
@@ -222,32 +237,30 @@ class Player(pygame.sprite.Sprite):
         return shield_surface
 
     def code_burst(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock()
         if current_time - self.last_burst_time >= self.burst_cooldown:
             self.last_burst_time = current_time
-            for effect in range(8):  # Create 8 burst particles
-                angle = effect * (360 / 8)
-                dx = math.cos(math.radians(angle)) * 5
-                dy = math.sin(math.radians(angle)) * 5
-                particle = TeleportEffect(self.rect.centerx, self.rect.centery)
-                particle.vel_x = dx
-                particle.vel_y = dy
-                self.teleport_effects.add(particle)
+            # Create 8 burst particles spread evenly around the player
+            velocities = [(math.cos(math.radians(effect * (360 / 8))) * 5,
+                           math.sin(math.radians(effect * (360 / 8))) * 5)
+                          for effect in range(8)]
+            self.teleport_effects.emit(self.rect.centerx, self.rect.centery, 8, velocities)
 
     def digital_dash(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock()
         if current_time - self.last_dash_time >= self.dash_cooldown:
             self.last_dash_time = current_time
             target_x = self.rect.x + (self.dash_distance if self.facing_right else -self.dash_distance)
-            for _ in range(5):  # Create dash effect particles
-                effect = TeleportEffect(self.rect.centerx, self.rect.centery)
-                self.teleport_effects.add(effect)
+            # Create dash effect particles
+            self.teleport_effects.emit(self.rect.centerx, self.rect.centery, 5)
             self.rect.x = target_x
 
     def system_hack(self, target_enemy):
         if not self.controlled_enemy:
             self.controlled_enemy = target_enemy
-            self.control_start_time = pygame.time.get_ticks()
+            self.control_start_time = self.clock()
+            # Enemy images are shared, so tint a copy rather than the original
+            target_enemy.image = target_enemy.image.copy()
             target_enemy.image.fill((0, 255, 0))  # Change color to indicate control
 
     def is_near_wall(self):
@@ -277,61 +290,64 @@ class Player(pygame.sprite.Sprite):
                     platform.kill()  # Remove the platform
 
 
-class TeleportEffect(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((20, 20))
-        self.image.fill((0, 255, 0))
-        self.image.set_alpha(128)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.life_time = random.randint(5, 10)
-        self.vel_x = random.uniform(-3, 3)
-        self.vel_y = random.uniform(-3, 3)
-        self.scale = random.uniform(0.5, 1.5)
-        
-        self.color = pygame.Color(random.randint(0, 255), 
-                                random.randint(0, 255), 
-                                random.randint(0, 255))
-        self.image.fill(self.color)
-        self.image = pygame.transform.scale(self.image, 
-                                          (int(20 * self.scale), int(20 * self.scale)))
+class TeleportDistortion(pygame.sprite.Sprite):
+    _layer = LAYER_EFFECTS
 
-    def update(self):
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        self.life_time -= 1
-        self.image.set_alpha(max(0, int(self.life_time * 12)))
-        if self.life_time <= 0:
-            self.kill()
+    # Ring expansion frames, baked once and shared by every distortion
+    frames = None
+    max_scale = 3
 
-class TeleportDistortion(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.image = pygame.Surface((50, 50), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (0, 255, 0), (25, 25), 25, 3)
+        if TeleportDistortion.frames is None:
+            TeleportDistortion.frames = self.bake_frames()
+        self.image = self.frames[0]
         self.rect = self.image.get_rect(center=(x, y))
-        self.scale = 1.0
-        self.alpha = 255
-        self.max_scale = 3
+        self.center = (x, y)
+        self.frame_index = 0
         self.life_time = 20
 
+    @classmethod
+    def bake_frames(cls):
+        """Render the ring at every scale/alpha step it goes through while expanding"""
+        frames = [cls.draw_ring(1.0, 255)]
+        scale = 1.0
+        alpha = 255
+        while True:
+            scale += 0.1
+            alpha -= 12
+            if scale >= cls.max_scale or alpha <= 0:
+                break
+            frames.append(cls.draw_ring(scale, alpha))
+        return frames
+
+    @staticmethod
+    def draw_ring(scale, alpha):
+        image = pygame.Surface((50 * scale, 50 * scale), pygame.SRCALPHA)
+        pygame.draw.circle(image, (0, 255, 0), 
+                         (25 * scale, 25 * scale), 
+                         25 * scale, 3)
+        image.set_alpha(alpha)
+        return image
+
     def update(self):
-        self.scale += 0.1
-        self.alpha -= 12
-        if self.scale >= self.max_scale or self.alpha <= 0:
+        self.frame_index += 1
+        if self.frame_index >= len(self.frames):
             self.kill()
+            return
 
-        self.image = pygame.Surface((50 * self.scale, 50 * self.scale), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (0, 255, 0), 
-                         (25 * self.scale, 25 * self.scale), 
-                         25 * self.scale, 3)
-        self.image.set_alpha(self.alpha)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        self.image = self.frames[self.frame_index]
+        self.rect.size = self.image.get_size()
+        self.rect.center = self.center
 
 class Doppelganger(pygame.sprite.Sprite):
+    _layer = LAYER_PLAYER
+
     def __init__(self, walk_frames):
         super().__init__()
-        self.frames = walk_frames
+        # walk_frames is the player's {facing_right: frames} bank entry
+        self.frame_set = walk_frames
+        self.frames = walk_frames[True]
         self.current_frame = 0
         self.image = self.frames[self.current_frame]
         self.rect = self.image.get_rect(center=(400, 550))
@@ -349,8 +365,11 @@ class Doppelganger(pygame.sprite.Sprite):
         self.animation_speed = 0.2
         self.animation_timer = 0
 
+        # Shares the player's input for the current tick
+        self.controls = None
+
     def update(self):
-        keys = pygame.key.get_pressed()
+        keys = self.controls.keys if self.controls is not None else pygame.key.get_pressed()
         self.moving = False
         
         if keys[pygame.K_a]:
@@ -390,32 +409,46 @@ class Doppelganger(pygame.sprite.Sprite):
             self.current_frame = (self.current_frame + 1) % len(self.frames)
             self.animation_timer = 0
             
-            frame = self.frames[self.current_frame]
-            if not self.facing_right:
-                frame = pygame.transform.flip(frame, True, False)
-            self.image = frame
+            self.image = self.frame_set[self.facing_right][self.current_frame]
+
+class ProjectileSprites:
+    """Projectile image scaled once, with rotated copies baked into angle buckets"""
+    def __init__(self, image, size=(20, 20), buckets=64):
+        if image.get_size() != size:
+            image = pygame.transform.scale(image, size)
+        self.image = image
+        self.buckets = buckets
+        self.rotations = [pygame.transform.rotate(image, -i * 360 / buckets)
+                          for i in range(buckets)]
+
+    def for_direction(self, dx, dy):
+        """Return the pre-rotated sprite closest to the direction (dx, dy)"""
+        angle = math.degrees(math.atan2(dy, dx))
+        return self.rotations[round(angle * self.buckets / 360) % self.buckets]
 
-class Fireball(pygame.sprite.Sprite):
-    def __init__(self, start_pos, target_pos, image):
-        super().__init__()
+class Fireball(PooledSprite):
+    _layer = LAYER_PROJECTILES
 
-        self.original_image = image  # Keep the original image for later rotations
-        self.image = pygame.transform.scale(self.original_image, (20, 20))  # Scale the fireball down
-        self.rect = self.image.get_rect(center=start_pos)
+    def __init__(self, start_pos, target_pos, sprites):
+        super().__init__()
+        self.reset(start_pos, target_pos, sprites)
 
+    def reset(self, start_pos, target_pos, sprites):
+        """Set up a new or recycled fireball"""
         # Calculate the direction vector to move the fireball
         dx = target_pos[0] - start_pos[0]
         dy = target_pos[1] - start_pos[1]
         distance = math.hypot(dx, dy)
+        if distance == 0:
+            dx, dy, distance = 1, 0, 1  # Clicked on the player; fire to the right
         
         # Normalize the vector to have a magnitude of 1 and multiply by speed
         self.direction = (dx / distance, dy / distance)
         self.speed = 10  # Speed of the fireball
 
-        # Calculate the angle for rotation
-        angle = math.degrees(math.atan2(dy, dx))
-        self.image = pygame.transform.rotate(self.image, -angle)  # Rotate the image
-        self.rect = self.image.get_rect(center=self.rect.center)  # Adjust the rect to match rotated image
+        # Pick the pre-rotated sprite for this direction
+        self.image = sprites.for_direction(dx, dy)
+        self.rect = self.image.get_rect(center=start_pos)
 
     def update(self):
         # Move the fireball in the direction of the mouse click
@@ -424,4 +457,7 @@ class Fireball(pygame.sprite.Sprite):
 
         # Remove fireball if it goes off screen
         if self.rect.right < 0 or self.rect.left > 800 or self.rect.bottom < 0 or self.rect.top > 600:
-            self.kill()
\ No newline at end of file
+            self.kill()
+
+
+fireball_pool = SpritePool(Fireball)
@@ -0,0 +1,74 @@
+# pool.py
+import pygame
+
+# Every pool created, by name, so their counters can be inspected together
+POOLS = {}
+
+
+class SpritePool:
+    """Per-type free list of killed sprites.
+
+    acquire() hands back a released sprite re-initialized through its reset()
+    method (a hit), or constructs a new one when the free list is empty (a miss).
+    """
+
+    def __init__(self, cls, name=None):
+        self.cls = cls
+        self.name = name or cls.__name__
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        POOLS[self.name] = self
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.pooled = False
+            sprite.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            sprite = self.cls(*args, **kwargs)
+            sprite.pool = self
+            self.misses += 1
+        return sprite
+
+    def acquire_unset(self):
+        """A sprite for the caller to fill in field by field, without reset().
+
+        Used to rebuild sprites from a snapshot: reset() would draw from the
+        game's random generator and pick fresh positions.
+        """
+        if self.free:
+            sprite = self.free.pop()
+            sprite.pooled = False
+            self.hits += 1
+        else:
+            sprite = self.cls.__new__(self.cls)
+            pygame.sprite.Sprite.__init__(sprite)
+            sprite.pool = self
+            self.misses += 1
+        return sprite
+
+    def release(self, sprite):
+        if not sprite.pooled:
+            sprite.pooled = True
+            self.free.append(sprite)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'free': len(self.free)}
+
+
+def pool_stats():
+    """Return hit/miss/free counters for every pool"""
+    return {name: pool.stats() for name, pool in POOLS.items()}
+
+
+class PooledSprite(pygame.sprite.Sprite):
+    """Sprite that goes back to the pool it came from when killed"""
+    pool = None
+    pooled = False
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
@@ -0,0 +1,114 @@
+# profiler.py
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+from text_render import renderer
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a ring buffer.
+
+    Game code brackets each phase with start(name) / stop(name). Times for a
+    phase that runs several times in a frame (one per sim step) add up. When
+    the profiler is disabled every call returns straight away.
+    """
+
+    def __init__(self, capacity=3600, refresh_every=30):
+        self.enabled = False
+        self.frames = deque(maxlen=capacity)
+        self.frame_index = 0
+        self.current = {}
+        self.open = {}
+        self.frame_start = 0.0
+
+        # The overlay is refreshed every few frames rather than every frame
+        self.refresh_every = refresh_every
+        self.summary_lines = []
+        self.graph = pygame.Surface((240, 60), pygame.SRCALPHA)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.open.clear()
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def start(self, name):
+        if not self.enabled:
+            return
+        self.open[name] = time.perf_counter()
+
+    def stop(self, name):
+        if not self.enabled:
+            return
+        started = self.open.pop(name, None)
+        if started is not None:
+            self.current[name] = self.current.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def end_frame(self):
+        """Close the current frame and push it into the ring buffer"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current['frame'] = (now - self.frame_start) * 1000
+        self.frames.append((self.frame_index, self.current))
+        self.frame_index += 1
+        self.current = {}
+        self.frame_start = now
+        if self.frame_index % self.refresh_every == 0:
+            self.summary_lines = self.summary()
+            self.draw_graph()
+
+    def percentiles(self):
+        """Return {phase: (p50, p95, p99)} in ms over the buffered frames"""
+        phases = {}
+        for _, timings in self.frames:
+            for name in timings:
+                phases.setdefault(name, None)
+        result = {}
+        for name in phases:
+            samples = np.array([timings.get(name, 0.0) for _, timings in self.frames])
+            result[name] = tuple(np.percentile(samples, (50, 95, 99)))
+        return result
+
+    def summary(self):
+        lines = [f"{'phase':<12}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        stats = sorted(self.percentiles().items(), key=lambda item: -item[1][1])
+        for name, (p50, p95, p99) in stats:
+            lines.append(f"{name:<12}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+        return lines
+
+    def export(self, path):
+        """Write the buffered frames as JSON lines"""
+        with open(path, 'w') as f:
+            for index, timings in self.frames:
+                f.write(json.dumps({'frame': index, 'ms': timings}) + '\n')
+        return len(self.frames)
+
+    def draw_graph(self):
+        """Redraw the frame-time graph: one column per frame, the line marks 60 FPS"""
+        graph = self.graph
+        width, height = graph.get_size()
+        graph.fill((0, 0, 0, 180))
+        scale = height / 33.3
+        recent = list(self.frames)[-width:]
+        for x, (_, timings) in enumerate(recent):
+            ms = timings.get('frame', 0.0)
+            color = (0, 255, 0) if ms <= 16.7 else (255, 80, 0)
+            bar = min(height, int(ms * scale))
+            pygame.draw.line(graph, color, (x, height - 1), (x, height - bar))
+        budget_y = height - int(16.7 * scale)
+        pygame.draw.line(graph, (255, 255, 255, 120), (0, budget_y), (width, budget_y))
+
+    def draw(self, surface, pos=(540, 10)):
+        """Frame-time graph plus per-phase percentiles; returns the area covered"""
+        area = surface.blit(self.graph, pos)
+        y = pos[1] + self.graph.get_height() + 4
+        for line in self.summary_lines:
+            text = renderer.render(line, (0, 255, 0), 18, None)
+            area.union_ip(surface.blit(text, (pos[0], y)))
+            y += text.get_height()
+        return area
@@ -0,0 +1,131 @@
+# render.py
+import pygame
+
+
+class DirtyRects:
+    """Tracks which parts of the screen changed so only those are presented.
+
+    Each frame starts with begin(), which blanks just the areas drawn last
+    frame instead of the whole screen. Everything drawn afterwards is reported
+    with add(). present() then pushes the union of last frame's and this
+    frame's areas through pygame.display.update().
+
+    Full-screen views (the unlock and game over screens) call invalidate();
+    that frame and the one after it are cleared and presented in full.
+    """
+
+    def __init__(self, size, background=(0, 0, 0)):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.background = background
+        self.previous = []
+        self.current = []
+        self.full = True
+        self.clear_all = True
+
+        # Counters for comparing against a full flip
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels = 0
+
+    def begin(self, screen):
+        """Erase what was drawn last frame"""
+        self.clear_all = self.full
+        self.full = False
+        if self.clear_all:
+            screen.fill(self.background)
+        else:
+            fill = screen.fill
+            background = self.background
+            for rect in self.previous:
+                fill(background, rect)
+        self.current = []
+
+    def add(self, rects):
+        """Record areas drawn this frame; accepts one Rect or an iterable of them"""
+        if isinstance(rects, pygame.Rect):
+            self.current.append(rects)
+        else:
+            self.current.extend(rects)
+
+    def invalidate(self):
+        """Present the whole screen this frame and clear all of it next frame"""
+        self.full = True
+
+    def present(self):
+        self.frames += 1
+        if self.full or self.clear_all:
+            pygame.display.flip()
+            self.full_frames += 1
+            self.pixels += self.screen_rect.width * self.screen_rect.height
+        else:
+            screen_rect = self.screen_rect
+            rects = [rect.clip(screen_rect) for rect in self.previous + self.current]
+            rects = [rect for rect in rects if rect.width and rect.height]
+            pygame.display.update(rects)
+            self.pixels += sum(rect.width * rect.height for rect in rects)
+        self.previous = self.current
+        self.current = []
+
+    def coverage(self):
+        """Average fraction of the screen presented per frame"""
+        if not self.frames:
+            return 0.0
+        area = self.screen_rect.width * self.screen_rect.height
+        return self.pixels / (self.frames * area)
+
+
+# Draw order, back to front. Sprite classes pick theirs with a class-level
+# _layer, the attribute pygame's own layered groups read.
+LAYER_PLATFORMS = 0
+LAYER_ENEMIES = 1
+LAYER_PROJECTILES = 2
+LAYER_PLAYER = 3
+LAYER_EFFECTS = 4
+
+
+class RenderQueue:
+    """Collects a frame's blits and submits them in one Surface.blits per layer.
+
+    With sort_by_image, each layer is sorted by source surface so sprites
+    sharing an image are blitted back to back; overlap order inside a layer is
+    then not preserved. SDL's software blitter gains nothing from that (see
+    `python benchmark.py render`), so it is off by default.
+    """
+
+    def __init__(self, default_layer=LAYER_PLAYER, sort_by_image=False):
+        self.default_layer = default_layer
+        self.sort_by_image = sort_by_image
+        self.layers = {}
+
+    def __len__(self):
+        return sum(len(items) for items in self.layers.values())
+
+    def add(self, image, pos, layer=None):
+        if layer is None:
+            layer = self.default_layer
+        self.layers.setdefault(layer, []).append((image, pos))
+
+    def add_sprites(self, sprites, position=None):
+        """Queue every sprite at its rect, or at position(sprite) when given"""
+        layers = self.layers
+        default = self.default_layer
+        for sprite in sprites:
+            layer = getattr(sprite, '_layer', default)
+            pos = position(sprite) if position is not None else sprite.rect
+            items = layers.get(layer)
+            if items is None:
+                items = layers[layer] = []
+            items.append((sprite.image, pos))
+
+    def flush(self, surface, doreturn=False):
+        """Draw and empty the queue; with doreturn, returns the rects drawn"""
+        rects = []
+        for layer in sorted(self.layers):
+            items = self.layers[layer]
+            if self.sort_by_image:
+                items.sort(key=lambda item: id(item[0]))
+            drawn = surface.blits(items, doreturn=doreturn)
+            if doreturn:
+                rects.extend(drawn)
+        self.layers.clear()
+        return rects
@@ -0,0 +1,70 @@
+# replay.py
+"""Re-simulate a recorded session tick for tick.
+
+    python main.py --record session.grin      # or: python headless.py --record ...
+    python replay.py session.grin --repeat 5
+"""
+import argparse
+import os
+import statistics
+import time
+
+# Must be set before pygame initializes its display
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+from inputs import read_input_log
+from main import Game
+
+
+def replay(path, draw=False, game=None):
+    """Replay a log; returns timing stats and whether the end state matched"""
+    seed, frames, expected_digest = read_input_log(path)
+    if game is None:
+        game = Game(headless=True)
+    game.init_game(player_name='replay', seed=seed)
+
+    tick_ms = []
+    start = time.perf_counter()
+    for frame in frames:
+        tick_start = time.perf_counter()
+        running = game.step(frame)
+        if draw:
+            game.draw()
+        tick_ms.append((time.perf_counter() - tick_start) * 1000)
+        if not running:
+            break
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(tick_ms, n=100) if len(tick_ms) > 1 else tick_ms * 99
+    return {
+        'ticks': len(tick_ms),
+        'seconds': elapsed,
+        'ticks_per_second': len(tick_ms) / elapsed if elapsed else 0.0,
+        'p50_ms': quantiles[49],
+        'p95_ms': quantiles[94],
+        'p99_ms': quantiles[98],
+        'score': game.score,
+        'matches': not expected_digest or game.state_digest() == expected_digest,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Gone Rogue session")
+    parser.add_argument('log')
+    parser.add_argument('--draw', action='store_true', help="render every tick as well")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="replay several times to get steadier timings")
+    args = parser.parse_args()
+
+    game = Game(headless=True)
+    for _ in range(args.repeat):
+        stats = replay(args.log, args.draw, game)
+        print(f"{stats['ticks']} ticks in {stats['seconds']:.2f} s "
+              f"({stats['ticks_per_second']:.0f} ticks/s), per tick p50 {stats['p50_ms']:.3f} ms "
+              f"p95 {stats['p95_ms']:.3f} ms p99 {stats['p99_ms']:.3f} ms, score {stats['score']}, "
+              f"{'matches recording' if stats['matches'] else 'DIVERGED from recording'}")
+    game.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+# snapshot.py
+import struct
+
+import numpy as np
+import pygame
+
+from assets import assets
+from enemy import Enemy, enemy_pool
+from entities import KIND_ENEMY
+from inputs import SEED_MASK
+from platforms import platform_pool
+from player import Doppelganger, TeleportDistortion, fireball_pool
+
+# Snapshot format: fixed-size structs for the game, its RNG, the abilities and
+# the player, then NumPy arrays for every variable-length collection. Counts
+# come first in the header so a reader knows every section's size up front.
+SNAPSHOT_MAGIC = b'GRSN'
+SNAPSHOT_VERSION = 1
+# magic, version, movers, fireballs, distortions, particles, palette size, unlock times
+SNAPSHOT_HEADER = struct.Struct('<4sHIIIIHH')
+# seed, sim ticks, score, spawn timers and delays, game over, paused, score
+# saved, has doppelganger, has a cached gauss, the cached gauss
+SNAPSHOT_GAME = struct.Struct('<QIqiiii?????d')
+SNAPSHOT_RNG = struct.Struct('<625I')  # Mersenne Twister key and position
+SNAPSHOT_ABILITIES = struct.Struct('<Hi?')  # unlocked mask, next unlock, selecting
+# rect, PLAYER_NUMBERS, which of those are ints, PLAYER_FLAGS, teleport target,
+# slot of the controlled enemy (-1 for none)
+SNAPSHOT_PLAYER = struct.Struct('<4i12dHHiii')
+SNAPSHOT_DOPPELGANGER = struct.Struct('<4i5dBB')  # rect, numbers, int mask, flags
+SNAPSHOT_PARTICLE_RNG = struct.Struct('<4QBI')  # PCG64 state and inc, buffered uint32
+
+# Numbers that start as ints and may turn into floats; restoring the same
+# type keeps state_digest() identical
+PLAYER_NUMBERS = ('vel_x', 'vel_y', 'gravity', 'shield_health', 'current_frame',
+                  'animation_timer', 'time_slow_start', 'matrix_vision_start',
+                  'wall_run_timer', 'last_burst_time', 'last_dash_time', 'control_start_time')
+PLAYER_FLAGS = ('on_ground', 'on_platform', 'moving', 'facing_right', 'punching',
+                'is_teleporting', 'time_slow_active', 'matrix_vision_active', 'wall_running',
+                'shield_active')
+PLAYER_HAS_TELEPORT_TARGET = 1 << len(PLAYER_FLAGS)
+DOPPELGANGER_NUMBERS = ('vel_x', 'vel_y', 'gravity', 'current_frame', 'animation_timer')
+DOPPELGANGER_FLAGS = ('on_ground', 'moving', 'facing_right')
+
+# Per-mover byte: the enemy's image index, or platform bits
+MOVER_START_PLATFORM = 0x10
+MOVER_HAS_JUMPED = 0x20
+
+# all_sprites order codes; mover slots are >= 0
+ORDER_PLAYER = -1
+ORDER_DOPPELGANGER = -2
+ORDER_FIREBALL = -3  # The next fireball, in the order they were saved
+
+
+def pack_numbers(obj, names):
+    values = [getattr(obj, name) for name in names]
+    int_mask = 0
+    for bit, value in enumerate(values):
+        if isinstance(value, int):
+            int_mask |= 1 << bit
+    return values, int_mask
+
+
+def unpack_numbers(obj, names, values, int_mask):
+    for bit, (name, value) in enumerate(zip(names, values)):
+        setattr(obj, name, int(value) if int_mask & (1 << bit) else value)
+
+
+def pack_flags(obj, names):
+    flags = 0
+    for bit, name in enumerate(names):
+        if getattr(obj, name):
+            flags |= 1 << bit
+    return flags
+
+
+def unpack_flags(obj, names, flags):
+    for bit, name in enumerate(names):
+        setattr(obj, name, bool(flags & (1 << bit)))
+
+
+def enemy_image_indices():
+    """Index in Enemy.enemy_images of each shared enemy image, by id"""
+    return {id(assets.get(name)): index for index, name in enumerate(Enemy.enemy_images)}
+
+
+def take_snapshot(game):
+    """Serialize everything a run's future depends on to bytes.
+
+    Covers the game's counters and spawn timers, its random generator, the
+    ability system's unlock progress, the player (movement, animation,
+    ability timers, particles and their generator, teleport distortions,
+    doppelganger) and every platform, enemy and fireball, including the order
+    of the sprite groups, which collisions depend on. Images are rebuilt from
+    that state, so ability tints are not kept. The matrix rain and the unlock
+    screen's effects are cosmetic and are left as they are.
+    """
+    player = game.player
+    store = game.movers
+    n = len(store)
+    _, rng_state, gauss = game.rng.getstate()
+
+    # Movers are saved in slot order; the groups' order goes in the order codes
+    images = enemy_image_indices()
+    mover_flags = np.zeros(n, dtype=np.uint8)
+    for slot, sprite in enumerate(store.sprites):
+        if store.kind[slot] == KIND_ENEMY:
+            mover_flags[slot] = images.get(id(sprite.image), 0)
+        elif sprite.pool is None:
+            mover_flags[slot] = MOVER_START_PLATFORM
+            if sprite.has_jumped:
+                mover_flags[slot] |= MOVER_HAS_JUMPED
+
+    fireballs = []
+    order = []
+    doppelganger = player.doppelganger
+    for sprite in game.all_sprites:
+        if sprite is player:
+            order.append(ORDER_PLAYER)
+        elif sprite is doppelganger:
+            order.append(ORDER_DOPPELGANGER)
+        elif getattr(sprite, 'store', None) is store:
+            order.append(sprite.slot)
+        else:
+            order.append(ORDER_FIREBALL)
+            fireballs.append(sprite)
+    fireball_rects = np.array([tuple(sprite.rect) for sprite in fireballs],
+                              dtype=np.int32).reshape(-1, 4)
+    fireball_motion = np.array([sprite.direction + (sprite.speed,) for sprite in fireballs],
+                               dtype=np.float64).reshape(-1, 3)
+
+    distortions = np.array([sprite.center + (sprite.frame_index,)
+                            for sprite in player.teleport_distortions],
+                           dtype=np.int32).reshape(-1, 3)
+
+    particles = player.teleport_effects
+    p = len(particles)
+    particle_rng = particles.rng.bit_generator.state
+    if particle_rng['bit_generator'] != 'PCG64':
+        raise ValueError("particle snapshots expect a PCG64 generator")
+    state = particle_rng['state']['state']
+    inc = particle_rng['state']['inc']
+
+    abilities = game.ability_system
+    unlocked = 0
+    for bit, ability in enumerate(abilities.abilities.values()):
+        if ability.unlocked:
+            unlocked |= 1 << bit
+
+    numbers, int_mask = pack_numbers(player, PLAYER_NUMBERS)
+    flags = pack_flags(player, PLAYER_FLAGS)
+    target = (0, 0)
+    if player.teleport_pos is not None:
+        flags |= PLAYER_HAS_TELEPORT_TARGET
+        target = player.teleport_pos
+    controlled = player.controlled_enemy
+    controlled_slot = controlled.slot if controlled is not None and controlled.store is store else -1
+
+    chunks = [
+        SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, n, len(fireballs),
+                             len(distortions), p, len(particles.palette),
+                             len(abilities.unlock_times)),
+        SNAPSHOT_GAME.pack(game.seed & SEED_MASK, game.sim_ticks, game.score,
+                           game.enemy_spawn_timer, game.platform_spawn_timer, game.enemy_spawn_delay,
+                           game.platform_spawn_delay, game.game_over, game.paused,
+                           game.score_saved, doppelganger is not None, gauss is not None,
+                           gauss or 0.0),
+        SNAPSHOT_RNG.pack(*rng_state),
+        SNAPSHOT_ABILITIES.pack(unlocked, abilities.next_unlock_index,
+                                abilities.selection_active),
+        struct.pack(f'<{len(abilities.unlock_times)}i', *abilities.unlock_times),
+        SNAPSHOT_PLAYER.pack(*player.rect, *numbers, int_mask, flags, *target, controlled_slot),
+    ]
+    if doppelganger is not None:
+        numbers, int_mask = pack_numbers(doppelganger, DOPPELGANGER_NUMBERS)
+        chunks.append(SNAPSHOT_DOPPELGANGER.pack(
+            *doppelganger.rect, *numbers, int_mask,
+            pack_flags(doppelganger, DOPPELGANGER_FLAGS)))
+    chunks += [
+        SNAPSHOT_PARTICLE_RNG.pack(state >> 64, state & 0xFFFFFFFFFFFFFFFF,
+                                   inc >> 64, inc & 0xFFFFFFFFFFFFFFFF,
+                                   particle_rng['has_uint32'], particle_rng['uinteger']),
+        np.array(particles.palette, dtype=np.uint8).tobytes(),
+        particles.pos[:p].tobytes(),
+        particles.vel[:p].tobytes(),
+        particles.life[:p].astype('<i4').tobytes(),
+        particles.color[:p].astype('<i4').tobytes(),
+        particles.scale[:p].astype('<i4').tobytes(),
+        store.pos[:n].tobytes(),
+        store.vel[:n].tobytes(),
+        store.size[:n].astype('<i4').tobytes(),
+        store.kind[:n].tobytes(),
+        mover_flags.tobytes(),
+        fireball_rects.tobytes(),
+        fireball_motion.tobytes(),
+        distortions.tobytes(),
+        np.array(order, dtype='<i4').tobytes(),
+    ]
+    return b''.join(chunks)
+
+
+class SnapshotReader:
+    """Walks a snapshot's sections in order"""
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def array(self, dtype, count, width=None):
+        dtype = np.dtype(dtype)
+        total = count * (width or 1)
+        array = np.frombuffer(self.data, dtype, total, self.offset)
+        self.offset += total * dtype.itemsize
+        return array.reshape(count, width) if width else array
+
+
+def restore_snapshot(game, data):
+    """Put game back in the state take_snapshot() saved.
+
+    The game must have been started with init_game() (so its assets and
+    player exist). The saved sprites are rebuilt from the live ones and the
+    pools without reset(); any left over go back to their pools.
+    """
+    reader = SnapshotReader(data)
+    (magic, version, n, fireball_count, distortion_count, p, palette_size,
+     unlock_count) = reader.unpack(SNAPSHOT_HEADER)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"not a version {SNAPSHOT_VERSION} game snapshot")
+    (seed, sim_ticks, score, enemy_spawn_timer, platform_spawn_timer, enemy_spawn_delay,
+     platform_spawn_delay, game_over, paused, score_saved, has_doppelganger, has_gauss,
+     gauss) = reader.unpack(SNAPSHOT_GAME)
+    # Faster than SNAPSHOT_RNG.unpack for 625 values
+    rng_state = tuple(reader.array('<u4', 625).tolist())
+    unlocked, next_unlock_index, selection_active = reader.unpack(SNAPSHOT_ABILITIES)
+    unlock_times = reader.unpack(struct.Struct(f'<{unlock_count}i'))
+    player_fields = reader.unpack(SNAPSHOT_PLAYER)
+    doppelganger_fields = reader.unpack(SNAPSHOT_DOPPELGANGER) if has_doppelganger else None
+    state_hi, state_lo, inc_hi, inc_lo, has_uint32, uinteger = reader.unpack(
+        SNAPSHOT_PARTICLE_RNG)
+    palette = reader.array(np.uint8, palette_size, 3)
+    particle_pos = reader.array('<f8', p, 2)
+    particle_vel = reader.array('<f8', p, 2)
+    particle_life = reader.array('<i4', p)
+    particle_color = reader.array('<i4', p)
+    particle_scale = reader.array('<i4', p)
+    pos = reader.array('<f8', n, 2)
+    vel = reader.array('<f8', n, 2)
+    size = reader.array('<i4', n, 2)
+    kind = reader.array(np.int8, n)
+    kinds = kind.tolist()
+    mover_flags = reader.array(np.uint8, n).tolist()
+    fireball_rects = reader.array('<i4', fireball_count, 4).tolist()
+    fireball_motion = reader.array('<f8', fireball_count, 3).tolist()
+    distortions = reader.array('<i4', distortion_count, 3).tolist()
+    order = reader.array('<i4', n + fireball_count + 1 + has_doppelganger).tolist()
+
+    player = game.player
+    store = game.movers
+
+    # Pooled sprites hold nothing beyond what was saved, so the live ones are
+    # refilled first and only the shortfall comes from (or goes back to) the pools
+    spare = {enemy_pool: [], platform_pool: [], fireball_pool: list(game.fireballs)}
+    for sprite in store.sprites:
+        if sprite.pool is not None:
+            spare[sprite.pool].append(sprite)
+    store.clear()
+    for group in (game.all_sprites, game.enemies, game.platforms, game.fireballs,
+                  player.teleport_distortions):
+        group.empty()
+    player.doppelganger = None
+
+    def reuse(pool):
+        sprites = spare[pool]
+        return sprites.pop() if sprites else pool.acquire_unset()
+
+    # Movers
+    if n > len(store.kind):
+        store.grow(n)
+    store.pos[:n] = pos
+    store.vel[:n] = vel
+    store.size[:n] = size
+    store.kind[:n] = kind
+    topleft = np.floor(pos).astype(np.int64).tolist()
+    size = size.tolist()
+    vel = vel.tolist()
+    enemy_images = [assets.get(name) for name in Enemy.enemy_images]
+    platform_image = assets.get('server.png')
+    movers = []
+    for slot, flags in enumerate(mover_flags):
+        vx, vy = vel[slot]
+        if kinds[slot] == KIND_ENEMY:
+            sprite = reuse(enemy_pool)
+            sprite.rng = game.rng
+            sprite.image = enemy_images[flags & 0x0F]
+            sprite.speed = 3
+            sprite.vel_x, sprite.vel_y = vx, vy
+        else:
+            if flags & MOVER_START_PLATFORM:
+                sprite = game.make_start_platform()
+                sprite.has_jumped = bool(flags & MOVER_HAS_JUMPED)
+            else:
+                sprite = reuse(platform_pool)
+                sprite.image = platform_image
+            sprite.speed = int(vx) if vx.is_integer() else vx
+            sprite.direction = -1 if vx > 0 else 1
+        sprite.rect = pygame.Rect(topleft[slot], size[slot])
+        sprite.store = store
+        sprite.slot = slot
+        movers.append(sprite)
+    store.sprites = movers
+    store.rects = [sprite.rect for sprite in movers]
+    store.count = n
+
+    fireballs = []
+    sprites = game.fireball_sprites
+    for (x, y, w, h), (dx, dy, speed) in zip(fireball_rects, fireball_motion):
+        sprite = reuse(fireball_pool)
+        sprite.direction = (dx, dy)
+        sprite.speed = int(speed) if speed.is_integer() else speed
+        sprite.image = sprites.for_direction(dx, dy)
+        sprite.rect = pygame.Rect(x, y, w, h)
+        fireballs.append(sprite)
+
+    for pool, sprites in spare.items():
+        for sprite in sprites:
+            pool.release(sprite)
+
+    # Player
+    x, y, w, h = player_fields[:4]
+    unpack_numbers(player, PLAYER_NUMBERS, player_fields[4:16], player_fields[16])
+    flags = player_fields[17]
+    unpack_flags(player, PLAYER_FLAGS, flags)
+    player.teleport_pos = player_fields[18:20] if flags & PLAYER_HAS_TELEPORT_TARGET else None
+    controlled_slot = player_fields[20]
+    player.controlled_enemy = movers[controlled_slot] if controlled_slot >= 0 else None
+    player.rect = pygame.Rect(x, y, w, h)
+    animation = 'punch' if player.punching else 'walk' if player.moving else 'idle'
+    frames = player.frame_bank[animation][player.facing_right]
+    player.image = frames[player.current_frame % len(frames)]
+
+    doppelganger = None
+    if doppelganger_fields is not None:
+        doppelganger = Doppelganger(player.frame_bank['walk'])
+        x, y, w, h = doppelganger_fields[:4]
+        unpack_numbers(doppelganger, DOPPELGANGER_NUMBERS, doppelganger_fields[4:9],
+                       doppelganger_fields[9])
+        unpack_flags(doppelganger, DOPPELGANGER_FLAGS, doppelganger_fields[10])
+        doppelganger.rect = pygame.Rect(x, y, w, h)
+        doppelganger.image = doppelganger.frame_set[doppelganger.facing_right][
+            doppelganger.current_frame]
+        doppelganger.controls = player.controls
+        player.doppelganger = doppelganger
+
+    for cx, cy, frame_index in distortions:
+        distortion = TeleportDistortion(cx, cy)
+        distortion.frame_index = frame_index
+        distortion.image = distortion.frames[frame_index]
+        distortion.rect = distortion.image.get_rect(center=(cx, cy))
+        player.teleport_distortions.add(distortion)
+
+    particles = player.teleport_effects
+    if p > len(particles.life):
+        particles.grow(p)
+    particles.pos[:p] = particle_pos
+    particles.vel[:p] = particle_vel
+    particles.life[:p] = particle_life
+    particles.color[:p] = particle_color
+    particles.scale[:p] = particle_scale
+    particles.count = p
+    palette = [tuple(rgb) for rgb in palette.tolist()]
+    if palette != particles.palette:
+        particles.palette = palette
+        particles.quads = [None] * (palette_size * len(particles.scales) * particles.alpha_steps)
+        particles.baked = set()
+    particles.rng.bit_generator.state = {
+        'bit_generator': 'PCG64',
+        'state': {'state': state_hi << 64 | state_lo, 'inc': inc_hi << 64 | inc_lo},
+        'has_uint32': has_uint32,
+        'uinteger': uinteger,
+    }
+
+    # Groups, in their saved order
+    members = []
+    fireball_iter = iter(fireballs)
+    for code in order:
+        if code >= 0:
+            members.append(movers[code])
+        elif code == ORDER_PLAYER:
+            members.append(player)
+        elif code == ORDER_DOPPELGANGER:
+            members.append(doppelganger)
+        else:
+            members.append(next(fireball_iter))
+    game.all_sprites.empty()
+    game.all_sprites.add(*members)
+    game.enemies.add(*[movers[code] for code in order
+                       if code >= 0 and kinds[code] == KIND_ENEMY])
+    game.platforms.add(*[movers[code] for code in order
+                         if code >= 0 and kinds[code] != KIND_ENEMY])
+    game.fireballs.add(*fireballs)
+
+    abilities = game.ability_system
+    for bit, ability in enumerate(abilities.abilities.values()):
+        ability.unlocked = bool(unlocked & (1 << bit))
+    abilities.next_unlock_index = next_unlock_index
+    abilities.selection_active = selection_active
+    abilities.unlock_times = list(unlock_times)
+
+    game.seed = seed
+    game.sim_ticks = sim_ticks
+    game.score = score
+    game.enemy_spawn_timer = enemy_spawn_timer
+    game.platform_spawn_timer = platform_spawn_timer
+    game.enemy_spawn_delay = enemy_spawn_delay
+    game.platform_spawn_delay = platform_spawn_delay
+    game.game_over = game_over
+    game.paused = paused
+    game.score_saved = score_saved
+    game.prev_positions = {}
+    if game.dirty_rects is not None:
+        game.dirty_rects.invalidate()
+    # Last: building the start platform above draws from the generator
+    game.rng.setstate((3, rng_state, gauss if has_gauss else None))
@@ -0,0 +1,75 @@
+# spatial.py
+
+
+class SpatialHash:
+    """Uniform-grid broadphase for sprite collision queries.
+
+    Sprites are bucketed by the grid cells their rect covers, so a query only
+    tests sprites that share a cell with the query rect instead of the whole
+    group. The grid is rebuilt once per tick after everything has moved.
+    """
+
+    def __init__(self, cell_size=100):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}
+        self.pair_tests = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (range(rect.left // size, max(rect.right - 1, rect.left) // size + 1),
+                range(rect.top // size, max(rect.bottom - 1, rect.top) // size + 1))
+
+    def insert(self, sprite):
+        self.order[sprite] = len(self.order)
+        cols, rows = self.cell_range(sprite.rect)
+        cells = self.cells
+        for cx in cols:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [sprite]
+                else:
+                    bucket.append(sprite)
+
+    def build(self, sprites):
+        """Rebuild the grid from scratch for the given sprites"""
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, rect, ordered=True):
+        """Return sprites sharing a cell with rect.
+
+        With ordered=True the result follows insertion (group) order, which keeps
+        order-dependent responses such as platform riding deterministic.
+        """
+        cols, rows = self.cell_range(rect)
+        cells = self.cells
+        if len(cols) == 1 and len(rows) == 1:
+            return list(cells.get((cols[0], rows[0]), ()))
+        found = set()
+        for cx in cols:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        if ordered and len(found) > 1:
+            return sorted(found, key=self.order.__getitem__)
+        return list(found)
+
+    def collide(self, sprite, dokill=False):
+        """Drop-in for pygame.sprite.spritecollide against the sprites in the grid"""
+        rect = sprite.rect
+        candidates = self.query(rect, ordered=False)
+        self.pair_tests += len(candidates)
+        hits = [other for other in candidates
+                if rect.colliderect(other.rect) and other.alive()]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
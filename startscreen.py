@@ -1,14 +1,17 @@
 import pygame
-import json
 import os
 import time
 
+from leaderboard import LeaderboardStore
+from text_render import renderer
+
 class StartupScreen:
-    def __init__(self, screen, width, height):
+    def __init__(self, screen, width, height, leaderboard=None):
         self.screen = screen
         self.width = width
         self.height = height
-        self.font = pygame.font.Font(None, 32)  # Smaller font size (was 36)
+        self.font_size = 32  # Smaller font size (was 36)
+        self.font = renderer.font(None, self.font_size)
         self.GREEN = (0, 255, 0)
         self.BLACK = (0, 0, 0)
         
@@ -22,39 +25,40 @@ class StartupScreen:
         total_height = len(self.game_description) * self.line_height
         self.start_y = self.height * 0.15  # Start at 15% from the top (was height - total_height / 2)
         
-        self.highscores = self.load_highscores()
+        # Highscores are loaded once and shared with the game-over screen
+        self.leaderboard = leaderboard if leaderboard is not None else LeaderboardStore()
+        self.highscores = self.leaderboard.scores
+        
+        # perf_counter() time the title screen was first shown
+        self.first_frame_time = None
         
     def load_highscores(self):
-        try:
-            with open('highscores.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        return self.leaderboard.scores
             
     def save_highscore(self, name, score):
-        if name in self.highscores:
-            if score > self.highscores[name]:
-                self.highscores[name] = score
-        else:
-            self.highscores[name] = score
-            
-        with open('highscores.json', 'w') as f:
-            json.dump(self.highscores, f)
+        # Only updates memory; the store writes the file in the background
+        self.leaderboard.submit(name, score)
             
     def get_player_highscore(self, name):
-        return self.highscores.get(name, 0)
+        return self.leaderboard.get(name)
         
     def get_top_scores(self, limit=3):
-        # Sort scores in descending order and get top N
-        sorted_scores = sorted(self.highscores.items(), key=lambda x: x[1], reverse=True)
-        return sorted_scores[:limit]
+        # The store keeps scores ranked, so this is a slice rather than a sort
+        return self.leaderboard.top(limit)
+
+    def get_player_rank(self, name):
+        return self.leaderboard.rank(name)
+        
+    def render(self, text):
+        # Text surfaces come from the shared cache, so static lines render once
+        return renderer.render(text, self.GREEN, self.font_size)
         
     def draw_text_lines(self, completed_lines, current_line="", current_line_index=0):
         self.screen.fill(self.BLACK)
         
         # Draw all completed lines
         for i, line in enumerate(completed_lines):
-            text_surface = self.font.render(line, True, self.GREEN)
+            text_surface = self.render(line)
             y_pos = self.start_y + (i * self.line_height)
             x_pos = (self.width - text_surface.get_width()) // 2  # Center horizontally
             self.screen.blit(text_surface, (x_pos, y_pos))
@@ -65,7 +69,7 @@ class StartupScreen:
             
         # Draw current typing line
         if current_line:
-            text_surface = self.font.render(current_line, True, self.GREEN)
+            text_surface = self.render(current_line)
             y_pos = self.start_y + (current_line_index * self.line_height)
             x_pos = (self.width - text_surface.get_width()) // 2  # Center horizontally
             self.screen.blit(text_surface, (x_pos, y_pos))
@@ -75,19 +79,21 @@ class StartupScreen:
                 self.draw_high_scores(y_pos + self.line_height)
             
         pygame.display.flip()
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter()
         
     def draw_high_scores(self, y_position):
         top_scores = self.get_top_scores()
         
         if not top_scores:
             text = "No scores yet..."
-            text_surface = self.font.render(text, True, self.GREEN)
+            text_surface = self.render(text)
             x_pos = (self.width - text_surface.get_width()) // 2
             self.screen.blit(text_surface, (x_pos, y_position))
         else:
             for i, (name, score) in enumerate(top_scores):
                 text = f"{i+1}. {name}: {score}"
-                text_surface = self.font.render(text, True, self.GREEN)
+                text_surface = self.render(text)
                 x_pos = (self.width - text_surface.get_width()) // 2
                 self.screen.blit(text_surface, (x_pos, y_position + i * self.line_height))
         
@@ -135,7 +141,7 @@ class StartupScreen:
         background.fill(self.BLACK)
         self.draw_text_lines(self.game_description)
         self.draw_high_scores(self.start_y + len(self.game_description) * self.line_height)
-        prompt_surface = self.font.render(name_prompt, True, self.GREEN)
+        prompt_surface = self.render(name_prompt)
         prompt_rect = prompt_surface.get_rect(center=(self.width//2, prompt_y))
         background.blit(prompt_surface, prompt_rect)
         
@@ -163,7 +169,7 @@ class StartupScreen:
             
             # Draw input box and text
             pygame.draw.rect(self.screen, self.GREEN, input_box, 2)
-            text_surface = self.font.render(name + ('|' if cursor_visible else ''), True, self.GREEN)
+            text_surface = self.render(name + ('|' if cursor_visible else ''))
             text_rect = text_surface.get_rect(center=input_box.center)
             self.screen.blit(text_surface, text_rect)
             
@@ -211,6 +217,12 @@ class StartupScreen:
         cursor_visible = True
         cursor_timer = 0
         
+        # Semi-transparent overlay behind the prompt, built once
+        overlay_height = self.line_height * 4
+        overlay = pygame.Surface((self.width, overlay_height))
+        overlay.fill(self.BLACK)
+        overlay.set_alpha(128)
+        
         while not done:
             clock.tick(60)
             cursor_timer += 1
@@ -234,14 +246,10 @@ class StartupScreen:
             self.screen.blit(background, (0, 0))
             
             # Draw semi-transparent overlay
-            overlay_height = self.line_height * 4
-            overlay = pygame.Surface((self.width, overlay_height))
-            overlay.fill(self.BLACK)
-            overlay.set_alpha(128)
             self.screen.blit(overlay, (0, prompt_y - self.line_height))
             
             # Draw prompt text
-            prompt_surface = self.font.render(name_prompt, True, self.GREEN)
+            prompt_surface = self.render(name_prompt)
             prompt_rect = prompt_surface.get_rect(center=(self.width//2, prompt_y))
             self.screen.blit(prompt_surface, prompt_rect)
             
@@ -251,7 +259,7 @@ class StartupScreen:
             
             # Draw input text with cursor
             display_text = name + ('|' if cursor_visible else ' ')
-            text_surface = self.font.render(display_text, True, self.GREEN)
+            text_surface = self.render(display_text)
             text_rect = text_surface.get_rect(center=input_box.center)
             self.screen.blit(text_surface, text_rect)
             
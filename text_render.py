@@ -0,0 +1,148 @@
+# text_render.py
+import json
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+class TextRenderer:
+    """Shared font and text-surface cache for HUD and menu text.
+
+    Fonts are created once per (name, size). Rendered strings are kept in an
+    LRU cache so static labels are rendered once. Fast-changing numbers such
+    as the score are composed from a per-font atlas of pre-rendered digits, so
+    a new value never goes through font.render().
+
+    Which file a (name, fallback) pair opens is resolved once and remembered
+    in cache_path, so later launches neither probe a missing font file nor
+    scan the system fonts again.
+    """
+
+    DIGITS = "0123456789-"
+
+    def __init__(self, max_entries=256, cache_path='fontcache.json'):
+        self.max_entries = max_entries
+        self.cache_path = cache_path
+        self.resolved = None
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.atlases = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load_resolved(self):
+        self.resolved = {}
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for name, sysfont, path in entries:
+            # A font that has since been removed gets resolved again
+            if path is None or os.path.exists(path):
+                self.resolved[(name, sysfont)] = path
+
+    def save_resolved(self):
+        if self.cache_path is None:
+            return
+        entries = [[name, sysfont, path] for (name, sysfont), path in self.resolved.items()]
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump(entries, f)
+        except OSError:
+            pass
+
+    def resolve(self, name, sysfont=None):
+        """Return the file to open for name (None is pygame's default font).
+
+        A missing name falls back to the system font sysfont, if given.
+        """
+        if self.resolved is None:
+            self.load_resolved()
+        key = (name, sysfont)
+        if key in self.resolved:
+            return self.resolved[key]
+        path = name
+        if name is not None and not os.path.exists(name):
+            if sysfont is None:
+                raise FileNotFoundError(name)
+            path = pygame.font.match_font(sysfont)
+        self.resolved[key] = path
+        self.save_resolved()
+        return path
+
+    def font(self, name=None, size=36, sysfont=None):
+        """Return a cached font; fall back to a system font if name can't be loaded"""
+        key = (name, size, sysfont)
+        font = self.fonts.get(key)
+        if font is None:
+            path = self.resolve(name, sysfont)
+            try:
+                font = pygame.font.Font(path, size)
+            except (OSError, pygame.error):
+                if sysfont is None or path is None:
+                    raise
+                font = pygame.font.Font(None, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, color, size=36, name=None, sysfont=None):
+        """Return a cached antialiased surface for text"""
+        key = (text, color, size, name, sysfont)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(name, size, sysfont).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def digit_atlas(self, color, size=36, name=None, sysfont=None):
+        key = (color, size, name, sysfont)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            font = self.font(name, size, sysfont)
+            atlas = {digit: font.render(digit, True, color) for digit in self.DIGITS}
+            self.atlases[key] = atlas
+        return atlas
+
+    def number_width(self, value, color, size=36, name=None, sysfont=None):
+        atlas = self.digit_atlas(color, size, name, sysfont)
+        return sum(atlas[digit].get_width() for digit in str(value))
+
+    def draw_number(self, surface, pos, value, color, size=36, name=None, sysfont=None,
+                    prefix=""):
+        """Blit an optional cached prefix followed by value from the digit atlas.
+
+        Returns the bounding rect of everything drawn.
+        """
+        x, y = pos
+        rect = pygame.Rect(x, y, 0, 0)
+        if prefix:
+            prefix_surface = self.render(prefix, color, size, name, sysfont)
+            rect.union_ip(surface.blit(prefix_surface, (x, y)))
+            x += prefix_surface.get_width()
+
+        atlas = self.digit_atlas(color, size, name, sysfont)
+        for digit in str(value):
+            glyph = atlas[digit]
+            rect.union_ip(surface.blit(glyph, (x, y)))
+            x += glyph.get_width()
+        return rect
+
+    def draw_centered(self, surface, text, color, center_x, y, size=36, name=None,
+                      sysfont=None):
+        """Blit cached text horizontally centred on center_x"""
+        text_surface = self.render(text, color, size, name, sysfont)
+        return surface.blit(text_surface, (center_x - text_surface.get_width() // 2, y))
+
+
+renderer = TextRenderer()
@@ -1,5 +1,9 @@
 import pygame
-import random
+import numpy as np
+
+from matrix_rain import GlyphAtlas
+from text_render import renderer
+
 class Ability:
     def __init__(self, name, description, icon=None):
         self.name = name
@@ -27,19 +31,14 @@ class MatrixAbilitySystem:
         
         # Timing for unlocks (in milliseconds)
         self.unlock_times = [10000, 20000, 30000, 40000]
-        self.next_unlock_index = 0
-        self.selection_active = False
-        self.game_start_time = pygame.time.get_ticks()
+        self.reset()
         
         # Load Matrix-style font (fallback to monospace system font if custom font not available)
-        try:
-            self.font_large = pygame.font.Font("matrix_font.ttf", 48)
-            self.font_medium = pygame.font.Font("matrix_font.ttf", 36)
-            self.font_small = pygame.font.Font("matrix_font.ttf", 24)
-        except:
-            self.font_large = pygame.font.SysFont("couriernew", 48)
-            self.font_medium = pygame.font.SysFont("couriernew", 36)
-            self.font_small = pygame.font.SysFont("couriernew", 24)
+        self.font_name = "matrix_font.ttf"
+        self.font_fallback = "couriernew"
+        self.font_large = renderer.font(self.font_name, 48, self.font_fallback)
+        self.font_medium = renderer.font(self.font_name, 36, self.font_fallback)
+        self.font_small = renderer.font(self.font_name, 24, self.font_fallback)
         
         # Matrix color scheme
         self.COLOR_MATRIX_GREEN = (0, 255, 0)
@@ -49,41 +48,123 @@ class MatrixAbilitySystem:
         
         # Matrix rain effect
         self.matrix_chars = [chr(i) for i in range(33, 127)]
-        self.rain_drops = []
+        self.rain_rng = np.random.default_rng()
+        self.rain_atlas = None
         self.init_rain_drops()
         
         # Scanning line effect
         self.scan_line_pos = 0
         self.scan_line_speed = 5
+        self.scan_line = pygame.Surface((800, 2), pygame.SRCALPHA)
+        self.scan_line.fill((0, 255, 0, 100))
+
+        # Unlock overlay layers, baked on first use and reused every frame
+        self.overlay = pygame.Surface((800, 600), pygame.SRCALPHA)
+        self.chrome_cache = {}
+        self.code_layers = None
+
+    def reset(self):
+        """Lock every ability again and restart the unlock timer"""
+        for ability in self.abilities.values():
+            ability.unlocked = False
+        self.next_unlock_index = 0
+        self.selection_active = False
+        self.game_start_time = pygame.time.get_ticks()
+
+    def render(self, text, color, size):
+        return renderer.render(text, color, size, self.font_name, self.font_fallback)
 
     def init_rain_drops(self):
-        for _ in range(50):  # Number of rain drops
-            self.rain_drops.append({
-                'x': random.randint(0, 800),
-                'y': random.randint(0, 600),
-                'speed': random.randint(5, 15)
-            })
+        count = 50  # Number of rain drops
+        self.rain_x = self.rain_rng.integers(0, 801, size=count)
+        self.rain_y = self.rain_rng.integers(0, 601, size=count)
+        self.rain_speed = self.rain_rng.integers(5, 16, size=count)
 
     def update_rain_drops(self):
-        for drop in self.rain_drops:
-            drop['y'] += drop['speed']
-            if drop['y'] > 600:
-                drop['y'] = 0
-                drop['x'] = random.randint(0, 800)
+        self.rain_y += self.rain_speed
+        wrapped = self.rain_y > 600
+        count = np.count_nonzero(wrapped)
+        if count:
+            self.rain_y[wrapped] = 0
+            self.rain_x[wrapped] = self.rain_rng.integers(0, 801, size=count)
 
     def draw_matrix_rain(self, surface):
-        for drop in self.rain_drops:
-            char = random.choice(self.matrix_chars)
-            color = (0, random.randint(150, 255), 0)
-            text = self.font_small.render(char, True, color)
-            surface.blit(text, (drop['x'], drop['y']))
+        if self.rain_atlas is None:
+            # A handful of green shades stands in for a random shade per character
+            shades = [(0, int(g), 0) for g in np.linspace(150, 255, 8)]
+            self.rain_atlas = GlyphAtlas(self.font_small, self.matrix_chars, shades)
+        glyphs = self.rain_atlas.pick(self.rain_rng, self.rain_x.size)
+        positions = zip(self.rain_x.tolist(), self.rain_y.tolist())
+        surface.blits(list(zip(glyphs, positions)), doreturn=False)
+
+    def button_rects(self, count):
+        button_height = 80
+        spacing = 20
+        start_y = 200
+        return [pygame.Rect(200, start_y + i * (button_height + spacing), 400, button_height)
+                for i in range(count)]
+
+    def bake_chrome(self, available_abilities):
+        """Render the title, buttons and ability text for one set of abilities"""
+        key = tuple(ability.name for ability in available_abilities)
+        chrome = self.chrome_cache.get(key)
+        if chrome is not None:
+            return chrome
+
+        rects = self.button_rects(len(available_abilities))
+        base = pygame.Surface((800, 600), pygame.SRCALPHA)
+
+        # Draw title
+        title = "SYSTEM UPGRADE AVAILABLE"
+        title_surface = self.render(title, self.COLOR_MATRIX_GREEN, 48)
+        base.blit(title_surface, title_surface.get_rect(center=(400, 100)))
+
+        hovered = []
+        for ability, button_rect in zip(available_abilities, rects):
+            pygame.draw.rect(base, self.COLOR_BLACK, button_rect)
+            pygame.draw.rect(base, self.COLOR_DARK_GREEN, button_rect, 1)
+            self.draw_button_text(base, ability, button_rect)
+
+            # Hover state is baked as its own button-sized surface
+            hover = pygame.Surface(button_rect.size, pygame.SRCALPHA)
+            local_rect = hover.get_rect()
+            pygame.draw.rect(hover, self.COLOR_DARK_GREEN, local_rect)
+            pygame.draw.rect(hover, self.COLOR_MATRIX_GREEN, local_rect, 2)
+            self.draw_button_text(hover, ability, local_rect)
+            hovered.append(hover)
+
+        chrome = (base, rects, hovered)
+        self.chrome_cache[key] = chrome
+        return chrome
+
+    def draw_button_text(self, surface, ability, button_rect):
+        # Draw ability name with console-style prefix
+        name_text = self.render(f"> {ability.name}", self.COLOR_MATRIX_GREEN, 36)
+        surface.blit(name_text, (button_rect.left + 10, button_rect.top + 10))
+
+        # Draw description with terminal-style formatting
+        desc_text = self.render(f"  [{ability.description}]", self.COLOR_MATRIX_GREEN, 24)
+        surface.blit(desc_text, (button_rect.left + 10, button_rect.top + 45))
+
+    def bake_code_layers(self, count=8):
+        """Pre-roll a few frames of the background "Matrix code" to cycle through"""
+        layers = []
+        for _ in range(count):
+            layer = pygame.Surface((400, 300), pygame.SRCALPHA)
+            for x in range(0, 400, 20):
+                for y in range(0, 300, 20):
+                    if self.rain_rng.random() < 0.1:
+                        char = self.matrix_chars[self.rain_rng.integers(len(self.matrix_chars))]
+                        layer.blit(self.render(char, (0, 50, 0), 24), (x, y))
+            layers.append(layer)
+        return layers
 
     def draw_unlock_screen(self):
         if not self.selection_active:
             return
 
-        # Create main surface with alpha
-        main_surface = pygame.Surface((800, 600), pygame.SRCALPHA)
+        # The overlay surface is reused between frames
+        main_surface = self.overlay
         main_surface.fill((0, 0, 0, 230))
 
         # Draw matrix rain
@@ -91,60 +172,30 @@ class MatrixAbilitySystem:
         self.draw_matrix_rain(main_surface)
 
         # Draw scanning line
-        scan_line = pygame.Surface((800, 2), pygame.SRCALPHA)
-        scan_line.fill((0, 255, 0, 100))
         self.scan_line_pos = (self.scan_line_pos + self.scan_line_speed) % 600
-        main_surface.blit(scan_line, (0, self.scan_line_pos))
-
-        # Draw title with "typing" effect
-        title = "SYSTEM UPGRADE AVAILABLE"
-        title_surface = self.font_large.render(title, True, self.COLOR_MATRIX_GREEN)
-        title_rect = title_surface.get_rect(center=(400, 100))
-        main_surface.blit(title_surface, title_rect)
+        main_surface.blit(self.scan_line, (0, self.scan_line_pos))
 
-        # Draw available abilities
-        available_abilities = self.get_available_abilities()
-        button_height = 80
-        spacing = 20
-        start_y = 200
+        # Title, buttons and ability text are baked once per set of abilities
+        base, rects, hovered = self.bake_chrome(self.get_available_abilities())
+        main_surface.blit(base, (0, 0))
 
         mouse_pos = pygame.mouse.get_pos()
-        
-        for i, ability in enumerate(available_abilities):
-            button_rect = pygame.Rect(200, start_y + i * (button_height + spacing), 400, button_height)
-            
-            # Check for hover
+        for button_rect, hover in zip(rects, hovered):
             if button_rect.collidepoint(mouse_pos):
                 # Draw "selected" effect
-                pygame.draw.rect(main_surface, self.COLOR_DARK_GREEN, button_rect)
-                pygame.draw.rect(main_surface, self.COLOR_MATRIX_GREEN, button_rect, 2)
-                
+                main_surface.blit(hover, button_rect)
+
                 # Draw glitch effect
-                if random.random() < 0.1:
-                    glitch_offset = random.randint(-2, 2)
-                    pygame.draw.rect(main_surface, self.COLOR_HIGHLIGHT, 
+                if self.rain_rng.random() < 0.1:
+                    glitch_offset = int(self.rain_rng.integers(-2, 3))
+                    pygame.draw.rect(main_surface, self.COLOR_HIGHLIGHT,
                                    button_rect.inflate(glitch_offset, 0), 1)
-            else:
-                pygame.draw.rect(main_surface, self.COLOR_BLACK, button_rect)
-                pygame.draw.rect(main_surface, self.COLOR_DARK_GREEN, button_rect, 1)
-
-            # Draw ability name with console-style prefix
-            name_text = self.font_medium.render(f"> {ability.name}", True, self.COLOR_MATRIX_GREEN)
-            name_rect = name_text.get_rect(topleft=(button_rect.left + 10, button_rect.top + 10))
-            main_surface.blit(name_text, name_rect)
-
-            # Draw description with terminal-style formatting
-            desc_text = self.font_small.render(f"  [{ability.description}]", True, self.COLOR_MATRIX_GREEN)
-            desc_rect = desc_text.get_rect(topleft=(button_rect.left + 10, button_rect.top + 45))
-            main_surface.blit(desc_text, desc_rect)
 
         # Draw "Matrix code" in the background of each button
-        for x in range(200, 600, 20):
-            for y in range(200, 500, 20):
-                if random.random() < 0.1:
-                    char = random.choice(self.matrix_chars)
-                    char_surface = self.font_small.render(char, True, (0, 50, 0))
-                    main_surface.blit(char_surface, (x, y))
+        if self.code_layers is None:
+            self.code_layers = self.bake_code_layers()
+        layer = self.code_layers[self.rain_rng.integers(len(self.code_layers))]
+        main_surface.blit(layer, (200, 200))
 
         # Blit the main surface to the screen
         self.screen.blit(main_surface, (0, 0))
@@ -152,11 +203,13 @@ class MatrixAbilitySystem:
     def get_available_abilities(self):
         return [ability for ability in self.abilities.values() if not ability.unlocked]
 
-    def check_unlock_time(self):
+    def check_unlock_time(self, current_time=None):
+        """current_time is play time in ms; defaults to wall-clock time since start"""
         if self.next_unlock_index >= len(self.unlock_times):
             return False  # No more abilities to unlock
 
-        current_time = pygame.time.get_ticks() - self.game_start_time
+        if current_time is None:
+            current_time = pygame.time.get_ticks() - self.game_start_time
         if current_time >= self.unlock_times[self.next_unlock_index]:
             self.selection_active = True
             self.next_unlock_index += 1  # Move to next unlock
@@ -169,12 +222,9 @@ class MatrixAbilitySystem:
             return None
 
         available_abilities = self.get_available_abilities()
-        button_height = 80
-        spacing = 20
-        start_y = 200
+        rects = self.button_rects(len(available_abilities))
 
-        for i, ability in enumerate(available_abilities):
-            button_rect = pygame.Rect(200, start_y + i * (button_height + spacing), 400, button_height)
+        for ability, button_rect in zip(available_abilities, rects):
             if button_rect.collidepoint(mouse_pos):
                 ability.unlocked = True
                 self.selection_active = False